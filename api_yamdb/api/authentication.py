@@ -0,0 +1,112 @@
+"""JWT-аутентификация без чтения пользователя из БД.
+
+В access-токен записываются username, role, is_staff и версия
+токенов пользователя. По ним собирается экземпляр User для проверок
+прав; из БД (через небольшой кэш) читается только версия, которая
+увеличивается при изменении прав и отзывает старые токены. username
+в токене справочный и после переименования может быть устаревшим.
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+from . import prometheus
+from .cache import get_cache
+
+VERSION_CLAIM = 'ver'
+
+
+def token_version_key(user_id):
+    return f'api:auth:{user_id}:token_version'
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов пользователя; None — пользователя нет."""
+    cache = get_cache()
+    version = cache.get(token_version_key(user_id))
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is not None:
+            cache.set(
+                token_version_key(user_id), version,
+                settings.TOKEN_VERSION_CACHE_TIMEOUT,
+            )
+    return version
+
+
+class UserAccessToken(AccessToken):
+    """AccessToken с данными, нужными для проверки прав."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token['role'] = user.role
+        token['is_staff'] = user.is_staff
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+def token_user(validated_token):
+    """Экземпляр User из claims: без запроса в БД, только для чтения."""
+    user = User(
+        id=validated_token[api_settings.USER_ID_CLAIM],
+        username=validated_token['username'],
+        role=validated_token['role'],
+        is_staff=validated_token['is_staff'],
+        token_version=validated_token[VERSION_CLAIM],
+    )
+    user._state.adding = False
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация по claims токена.
+
+    Токены без версии (выданные до её появления) обрабатываются
+    стандартно, с загрузкой пользователя. Отклонённые токены
+    считаются в метриках.
+    """
+
+    def authenticate(self, request):
+        try:
+            return super().authenticate(request)
+        except AuthenticationFailed as error:
+            codes = error.get_codes()
+            if isinstance(codes, dict):
+                codes = codes.get('code', 'authentication_failed')
+            prometheus.registry.inc(
+                'yamdb_jwt_auth_failures_total', reason=codes
+            )
+            raise
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        version = get_token_version(
+            validated_token[api_settings.USER_ID_CLAIM]
+        )
+        if version is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        if version != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                _('Token has been revoked'), code='token_revoked'
+            )
+        return token_user(validated_token)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_version(sender, instance, **kwargs):
+    get_cache().delete(token_version_key(instance.pk))
@@ -0,0 +1,219 @@
+"""Массовая загрузка каталога.
+
+Элементы проверяются по отдельности без запросов к БД, слаги и
+уникальные названия жанров и категорий разрешаются одним запросом на
+модель, запись идёт через bulk_create/bulk_update. Вызывающий код
+оборачивает загрузку в транзакцию: при любой ошибке не сохраняется
+ничего.
+"""
+from django.db import connection
+
+from reviews.models import Category, Genre, Title
+from reviews.search import get_search_backend
+from reviews.services import touch_titles
+
+from .serializers import (BulkCategorySerializer, BulkGenreSerializer,
+                          BulkTitleSerializer)
+
+TITLE_FIELDS = ('name', 'year', 'description')
+INDEX_CHUNK_SIZE = 500
+
+
+class BulkError(Exception):
+    """Ошибки элементов: список {'index': номер, 'errors': {...}}."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = sorted(errors, key=lambda error: error['index'])
+
+
+def validate_items(serializer_class, items):
+    """Возвращает пары (номер, данные) для верных элементов и ошибки."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        partial = isinstance(item, dict) and 'id' in item
+        serializer = serializer_class(data=item, partial=partial)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return valid, errors
+
+
+def check_names(model, valid):
+    """Ошибки уникального имени: повтор в запросе или у другого слага.
+
+    Имя, занятое объектом с другим слагом, считается занятым, даже если
+    тот объект переименовывается в этом же запросе.
+    """
+    errors, slugs = [], {}
+    taken = model.objects.in_bulk(
+        list({data['name'] for _, data in valid}), field_name='name'
+    )
+    for index, data in valid:
+        name, slug = data['name'], data['slug']
+        if slugs.setdefault(name, slug) != slug:
+            message = 'Название повторяется в запросе.'
+        elif name in taken and taken[name].slug != slug:
+            message = 'Название уже занято другим слагом.'
+        else:
+            continue
+        errors.append({'index': index, 'errors': {'name': [message]}})
+    return errors
+
+
+def save_slugged(model, serializer_class, items, titles_of):
+    """Создаёт новые объекты и переименовывает существующие по слагу.
+
+    titles_of(objs) — тайтлы, в которые вложены переименованные объекты:
+    их версия увеличивается, чтобы сбросить ETag.
+    """
+    valid, errors = validate_items(serializer_class, items)
+    by_slug = {}
+    for index, data in valid:
+        if data['slug'] in by_slug:
+            errors.append({
+                'index': index,
+                'errors': {'slug': ['Слаг повторяется в запросе.']},
+            })
+        by_slug[data['slug']] = data
+    if model._meta.get_field('name').unique:
+        errors.extend(check_names(model, valid))
+    if errors:
+        raise BulkError(errors)
+    existing = model.objects.in_bulk(list(by_slug), field_name='slug')
+    updated = []
+    for slug, obj in existing.items():
+        if obj.name != by_slug[slug]['name']:
+            obj.name = by_slug[slug]['name']
+            updated.append(obj)
+    model.objects.bulk_update(updated, ('name',))
+    if updated:
+        touch_titles(titles_of(updated))
+    model.objects.bulk_create(
+        model(**data) for slug, data in by_slug.items()
+        if slug not in existing
+    )
+    return {
+        'created': [slug for slug in by_slug if slug not in existing],
+        'updated': [obj.slug for obj in updated],
+    }
+
+
+def save_genres(items):
+    return save_slugged(
+        Genre, BulkGenreSerializer, items,
+        lambda genres: Title.objects.filter(
+            pk__in=Title.genre.through.objects.filter(
+                genre__in=genres
+            ).values('title_id')
+        ),
+    )
+
+
+def save_categories(items):
+    return save_slugged(
+        Category, BulkCategorySerializer, items,
+        lambda categories: Title.objects.filter(category__in=categories),
+    )
+
+
+def assign_ids(titles):
+    """Проставляет id созданным bulk_create тайтлам.
+
+    PostgreSQL возвращает их сам. SQLite пишет в один поток, а наша
+    транзакция после вставки держит блокировку записи, поэтому
+    последние len(titles) id принадлежат нам в порядке вставки.
+    """
+    if not titles or connection.features.can_return_ids_from_bulk_insert:
+        return
+    ids = Title.objects.order_by('-id').values_list(
+        'id', flat=True
+    )[:len(titles)]
+    for title, pk in zip(titles, reversed(list(ids))):
+        title.pk = pk
+
+
+def check_title(data, genres, categories, existing):
+    """Ошибки ссылок элемента на жанры, категорию и тайтл."""
+    errors = {}
+    missing = [slug for slug in data.get('genre', ()) if slug not in genres]
+    if missing:
+        errors['genre'] = [f'Жанр {slug} не найден.' for slug in missing]
+    if data.get('category') and data['category'] not in categories:
+        errors['category'] = [f'Категория {data["category"]} не найдена.']
+    if 'id' in data and data['id'] not in existing:
+        errors['id'] = ['Тайтл не найден.']
+    return errors
+
+
+def write_titles(rows, existing, genres, categories):
+    """Записывает проверенные элементы; возвращает (созданные, обновлённые)."""
+    created, updated, genre_links, replaced = [], [], [], []
+    for data in rows:
+        title = existing[data['id']] if 'id' in data else Title()
+        for field in TITLE_FIELDS:
+            if field in data:
+                setattr(title, field, data[field])
+        if 'category' in data:
+            title.category_id = categories.get(data['category'])
+        (updated if 'id' in data else created).append(title)
+        if 'genre' in data:
+            genre_links.append((title, data['genre']))
+            if 'id' in data:
+                replaced.append(title.pk)
+
+    Title.objects.bulk_create(created)
+    assign_ids(created)
+    Title.objects.bulk_update(updated, TITLE_FIELDS + ('category',))
+    GenreTitle = Title.genre.through
+    GenreTitle.objects.filter(title_id__in=replaced).delete()
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title_id=title.pk, genre_id=genres[slug])
+        for title, slugs in genre_links
+        for slug in dict.fromkeys(slugs)
+    )
+    touch_titles(Title.objects.filter(pk__in=[title.pk for title in updated]))
+    return created, updated
+
+
+def save_titles(items):
+    """Создаёт тайтлы без id и обновляет тайтлы с id.
+
+    Переданный список genre заменяет жанры тайтла целиком.
+    """
+    valid, errors = validate_items(BulkTitleSerializer, items)
+    genres = dict(Genre.objects.filter(slug__in={
+        slug for _, data in valid for slug in data.get('genre', ())
+    }).values_list('slug', 'id'))
+    categories = dict(Category.objects.filter(slug__in={
+        data['category'] for _, data in valid if data.get('category')
+    }).values_list('slug', 'id'))
+    existing = Title.objects.in_bulk([
+        data['id'] for _, data in valid if 'id' in data
+    ])
+
+    seen_ids = set()
+    rows = []
+    for index, data in valid:
+        item_errors = check_title(data, genres, categories, existing)
+        if 'id' in data and data['id'] in seen_ids:
+            item_errors['id'] = ['Тайтл повторяется в запросе.']
+        seen_ids.add(data.get('id'))
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+        else:
+            rows.append(data)
+    if errors:
+        raise BulkError(errors)
+
+    created, updated = write_titles(rows, existing, genres, categories)
+
+    ids = [title.pk for title in created + updated]
+    backend = get_search_backend()
+    for start in range(0, len(ids), INDEX_CHUNK_SIZE):
+        backend.index_many(ids[start:start + INDEX_CHUNK_SIZE])
+    return {
+        'created': [title.pk for title in created],
+        'updated': [title.pk for title in updated],
+    }
@@ -0,0 +1,98 @@
+"""Кэш ответов read-only эндпоинтов каталога.
+
+Ключ ответа содержит версию пространства имён (categories, genres,
+titles). После коммита записи в связанные модели версия растёт, и старые
+ключи просто перестают читаться: удалять их по маске не нужно.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title
+
+HITS_KEY = 'api:cache:hits'
+MISSES_KEY = 'api:cache:misses'
+
+# Какие пространства имён устаревают при изменении модели.
+INVALIDATES = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles',),
+    Title.genre.through: ('titles',),
+    Review: ('titles',),
+}
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def incr(key, delta=1):
+    cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Ключ успели вытеснить между add() и incr().
+        cache.set(key, delta, timeout=None)
+        return delta
+
+
+def version_key(namespace):
+    return f'api:cache:{namespace}:version'
+
+
+def get_version(namespace):
+    cache = get_cache()
+    version = cache.get(version_key(namespace))
+    if version is None:
+        cache.add(version_key(namespace), 1, timeout=None)
+        version = cache.get(version_key(namespace), 1)
+    return version
+
+
+def response_key(namespace, full_path):
+    digest = hashlib.md5(full_path.encode()).hexdigest()
+    return f'api:cache:{namespace}:{get_version(namespace)}:{digest}'
+
+
+def invalidate(*namespaces):
+    """Увеличивает версии пространств имён после коммита транзакции.
+
+    Иначе запрос между сигналом и коммитом прочитает старые строки и
+    положит их в кэш под новой версией до конца API_CACHE_TIMEOUT.
+    """
+    def bump():
+        for namespace in namespaces:
+            incr(version_key(namespace))
+    transaction.on_commit(bump)
+
+
+def get_stats():
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else None,
+    }
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_on_write(sender, **kwargs):
+    namespaces = INVALIDATES.get(sender)
+    if namespaces:
+        invalidate(*namespaces)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_on_genre_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate(*INVALIDATES[sender])
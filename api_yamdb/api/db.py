@@ -0,0 +1,130 @@
+"""Настройка соединений с БД: PRAGMA SQLite, проверка постоянных
+соединений и чтение с реплик."""
+import hashlib
+import math
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .cache import get_cache
+
+REPLICA = 'replica'
+PIN_COOKIE = 'pin_primary'
+
+_local = threading.local()
+
+
+def replica_aliases():
+    """Алиасы реплик: все базы, чьё имя начинается с `replica`."""
+    return [
+        alias for alias in connections.databases if alias.startswith(REPLICA)
+    ]
+
+
+@contextmanager
+def use_replica():
+    """Чтения внутри блока уходят на реплику, пока не было записи."""
+    previous = getattr(_local, 'replica', False), getattr(
+        _local, 'wrote', False
+    )
+    _local.replica, _local.wrote = True, False
+    try:
+        yield
+    finally:
+        _local.replica, _local.wrote = previous
+
+
+@contextmanager
+def use_primary():
+    """Чтения внутри блока идут с основной базы, даже внутри use_replica()."""
+    previous = getattr(_local, 'replica', False)
+    _local.replica = False
+    try:
+        yield
+    finally:
+        _local.replica = previous
+
+
+class ReplicaRouter:
+    """Запись и миграции — в default, чтение в use_replica() — с реплик.
+
+    После первой записи в блоке use_replica() чтение возвращается
+    на основную базу: реплика этой записи ещё не видела.
+    """
+
+    def db_for_read(self, model, **hints):
+        if getattr(_local, 'replica', False) and not _local.wrote:
+            aliases = replica_aliases()
+            if aliases:
+                return random.choice(aliases)
+        return None
+
+    def db_for_write(self, model, **hints):
+        if getattr(_local, 'replica', False):
+            _local.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return not db.startswith(REPLICA)
+
+
+def pin_key(request):
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return None
+    digest = hashlib.md5(authorization.encode()).hexdigest()
+    return f'api:db:pin:{digest}'
+
+
+def is_pinned(request):
+    """Клиент недавно писал и должен читать с основной базы."""
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    key = pin_key(request)
+    return key is not None and get_cache().get(key) is not None
+
+
+def pin(request, response):
+    """Закрепляет клиента за основной базой на DB_REPLICATION_LAG секунд.
+
+    Клиент узнаётся по cookie, а если он их не хранит — по заголовку
+    Authorization.
+    """
+    lag = math.ceil(settings.DB_REPLICATION_LAG)
+    if lag <= 0:
+        return
+    response.set_cookie(PIN_COOKIE, '1', max_age=lag)
+    key = pin_key(request)
+    if key is not None:
+        get_cache().set(key, True, lag)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_persistent_connections(**kwargs):
+    """Закрывает разорванные постоянные соединения до начала запроса.
+
+    Иначе первый запрос после рестарта БД получит ошибку.
+    """
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
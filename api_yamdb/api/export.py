@@ -0,0 +1,110 @@
+"""Потоковая выгрузка данных в CSV и NDJSON.
+
+Наборы и колонки совпадают с файлами static/data/*.csv, так что
+выгрузку можно загрузить обратно командой import_csv. Строки читаются
+через values_list().iterator(), поэтому память не зависит от объёма.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+# Набор -> (модель, ((колонка, поле), ...)).
+DATASETS = {
+    'users': (User, (
+        ('id', 'id'), ('username', 'username'), ('email', 'email'),
+        ('role', 'role'), ('bio', 'bio'), ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    )),
+    'category': (Category, (('id', 'id'), ('name', 'name'), ('slug', 'slug'))),
+    'genre': (Genre, (('id', 'id'), ('name', 'name'), ('slug', 'slug'))),
+    'titles': (Title, (
+        ('id', 'id'), ('name', 'name'), ('year', 'year'),
+        ('category', 'category_id'),
+    )),
+    'genre_title': (Title.genre.through, (
+        ('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id'),
+    )),
+    'review': (Review, (
+        ('id', 'id'), ('title_id', 'title_id'), ('text', 'text'),
+        ('author', 'author_id'), ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    'comments': (Comment, (
+        ('id', 'id'), ('review_id', 'review_id'), ('text', 'text'),
+        ('author', 'author_id'), ('pub_date', 'pub_date'),
+    )),
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+encoder = DjangoJSONEncoder()
+
+
+class Echo:
+    """Файлоподобный объект для csv.writer: возвращает строку как есть."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(dataset):
+    model, columns = DATASETS[dataset]
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    rows = model.objects.order_by('id').values_list(
+        *(field for _, field in columns)
+    ).iterator(chunk_size=chunk_size)
+    temporal = [
+        index for index, (_, field) in enumerate(columns)
+        if model._meta.get_field(field).get_internal_type()
+        in ('DateTimeField', 'DateField')
+    ]
+    for row in rows:
+        if temporal:
+            row = list(row)
+            for index in temporal:
+                if row[index] is not None:
+                    row[index] = encoder.default(row[index])
+        yield row
+
+
+def chunked(lines, size):
+    """Склеивает строки в куски, чтобы не писать в сокет по строке."""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_csv(dataset):
+    writer = csv.writer(Echo())
+    _, columns = DATASETS[dataset]
+    yield writer.writerow([column for column, _ in columns])
+    for row in iter_rows(dataset):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(dataset):
+    _, columns = DATASETS[dataset]
+    names = [column for column, _ in columns]
+    for row in iter_rows(dataset):
+        yield json.dumps(dict(zip(names, row)), ensure_ascii=False) + '\n'
+
+
+STREAMS = {'csv': stream_csv, 'ndjson': stream_ndjson}
+
+
+def stream(dataset, file_format):
+    return chunked(
+        STREAMS[file_format](dataset), settings.EXPORT_CHUNK_SIZE
+    )
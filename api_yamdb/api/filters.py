@@ -1,6 +1,29 @@
+from django.db.models import F, Q
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title
+from reviews.search import get_search_backend
+
+PREFIX_SUFFIX = '*'
+
+
+def slugs_to_ids(model, slugs):
+    """Превращает список слагов в id одним запросом.
+
+    Слаг со звёздочкой на конце (`dra*`) ищется по префиксу,
+    остальные — точным совпадением; оба варианта используют индекс.
+    """
+    exact = [slug for slug in slugs if not slug.endswith(PREFIX_SUFFIX)]
+    query = Q(slug__in=exact)
+    for slug in slugs:
+        if slug.endswith(PREFIX_SUFFIX):
+            query |= Q(slug__startswith=slug[:-len(PREFIX_SUFFIX)])
+    return list(model.objects.filter(query).values_list('id', flat=True))
+
+
+class SlugInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Фильтр по одному или нескольким слагам через запятую."""
 
 
 class TitlesFilter(filters.FilterSet):
@@ -8,15 +31,56 @@ class TitlesFilter(filters.FilterSet):
         field_name='name',
         lookup_expr='icontains'
     )
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
-    )
+    category = SlugInFilter(method='filter_category')
+    genre = SlugInFilter(method='filter_genre')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ('name', 'year', 'genre', 'category',)
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(category_id__in=slugs_to_ids(Category, value))
+
+    def filter_genre(self, queryset, name, value):
+        genre_titles = Title.genre.through.objects.filter(
+            genre_id__in=slugs_to_ids(Genre, value)
+        )
+        return queryset.filter(pk__in=genre_titles.values('title_id'))
+
+    def filter_search(self, queryset, name, value):
+        return get_search_backend().search(queryset, value)
+
+
+class TitlesOrderingFilter(OrderingFilter):
+    """`?ordering=` по хранимым полям тайтла с индексами.
+
+    К сортировке добавляется первичный ключ в том же направлении,
+    что и последнее поле: страницы LimitOffsetPagination не пересекаются
+    при равных значениях, а индекс по полю покрывает весь ORDER BY.
+    Тайтлы без отзывов (rating NULL) при сортировке по рейтингу идут
+    в конце в обе стороны: SQLite и PostgreSQL по умолчанию ставят NULL
+    на разные концы.
+    """
+    ordering_fields = ('rating', 'year', 'name', 'review_count')
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {'pk', '-pk'} & set(ordering):
+            direction = '-' if ordering[-1].startswith('-') else ''
+            ordering = [*ordering, f'{direction}pk']
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*map(self.nulls_last, ordering))
+
+    @staticmethod
+    def nulls_last(field):
+        if field.lstrip('-') != 'rating':
+            return field
+        if field.startswith('-'):
+            return F('rating').desc(nulls_last=True)
+        return F('rating').asc(nulls_last=True)
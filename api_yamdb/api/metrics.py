@@ -0,0 +1,131 @@
+"""Метрики запросов: SQL, время БД, сериализации и вьюхи.
+
+Метрики текущего запроса живут в thread-local, агрегаты по имени вьюхи
+(`api:title-list`) — в гистограммах внутри процесса.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+DURATION_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper для подключений к БД."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+def current():
+    return getattr(_local, 'metrics', None)
+
+
+def start():
+    _local.metrics = RequestMetrics()
+    return _local.metrics
+
+
+def stop():
+    _local.metrics = None
+
+
+@contextmanager
+def serializing():
+    """Добавляет время блока к времени сериализации запроса.
+
+    Учитывается только внешний блок: вложенные сериализаторы
+    и элементы many=True не считаются повторно.
+    """
+    metrics = current()
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - started
+        metrics.serializing = False
+
+
+class TimedSerializerMixin:
+    """Добавляет время to_representation к метрикам запроса."""
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+
+class Histogram:
+    """Гистограмма длительности и суммы счётчиков по вьюхам."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def observe(self, view_name, duration, metrics):
+        duration_ms = duration * 1000
+        with self.lock:
+            stats = self.views.get(view_name)
+            if stats is None:
+                stats = self.views[view_name] = {
+                    'count': 0,
+                    'duration_ms': 0.0,
+                    'db_ms': 0.0,
+                    'serializer_ms': 0.0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'buckets': [0] * len(DURATION_BUCKETS),
+                }
+            stats['count'] += 1
+            stats['duration_ms'] += duration_ms
+            stats['db_ms'] += metrics.db_time * 1000
+            stats['serializer_ms'] += metrics.serializer_time * 1000
+            stats['queries'] += metrics.queries
+            stats['max_queries'] = max(stats['max_queries'], metrics.queries)
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration_ms <= bound:
+                    stats['buckets'][index] += 1
+                    break
+
+    def snapshot(self):
+        with self.lock:
+            result = {}
+            for view_name, stats in self.views.items():
+                count = stats['count']
+                result[view_name] = {
+                    'count': count,
+                    'avg_ms': stats['duration_ms'] / count,
+                    'avg_db_ms': stats['db_ms'] / count,
+                    'avg_serializer_ms': stats['serializer_ms'] / count,
+                    'avg_queries': stats['queries'] / count,
+                    'max_queries': stats['max_queries'],
+                    'buckets': {
+                        str(bound): value for bound, value
+                        in zip(DURATION_BUCKETS, stats['buckets'])
+                    },
+                }
+            return result
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+
+histogram = Histogram()
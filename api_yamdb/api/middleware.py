@@ -0,0 +1,67 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics, prometheus
+
+
+class RequestMetricsMiddleware:
+    """SQL-запросы и время обработки в заголовке Server-Timing.
+
+    Обрабатывается доля запросов REQUEST_METRICS_SAMPLE_RATE; остальные
+    проходят без обёрток, поэтому middleware можно держать включённым.
+    Число запросов и их длительность для Prometheus считаются всегда.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        request_metrics = None
+        if random.random() < settings.REQUEST_METRICS_SAMPLE_RATE:
+            request_metrics = metrics.start()
+            try:
+                with ExitStack() as stack:
+                    for connection in connections.all():
+                        stack.enter_context(
+                            connection.execute_wrapper(request_metrics)
+                        )
+                    response = self.get_response(request)
+            finally:
+                metrics.stop()
+        else:
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        route = match.view_name if match is not None else 'unresolved'
+        prometheus.registry.inc(
+            'yamdb_http_requests_total', route=route,
+            method=request.method, status=response.status_code,
+        )
+        prometheus.registry.observe(
+            'yamdb_http_request_duration_seconds', duration,
+            prometheus.LATENCY_BUCKETS,
+            route=route, status=response.status_code,
+        )
+        if request_metrics is None:
+            return response
+        prometheus.registry.observe(
+            'yamdb_db_queries_per_request', request_metrics.queries,
+            prometheus.QUERY_BUCKETS, route=route,
+        )
+        response['Server-Timing'] = (
+            f'db;dur={request_metrics.db_time * 1000:.2f};'
+            f'desc="{request_metrics.queries} queries", '
+            f'serializer;dur={request_metrics.serializer_time * 1000:.2f}, '
+            f'view;dur={duration * 1000:.2f}'
+        )
+        if match is not None:
+            metrics.histogram.observe(
+                match.view_name, duration, request_metrics
+            )
+        return response
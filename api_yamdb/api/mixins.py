@@ -1,4 +1,24 @@
-from rest_framework import mixins, viewsets
+import hashlib
+from calendar import timegm
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.response import Response
+
+from reviews.models import Title
+
+from . import db, metrics
+from .bulk import BulkError
+from .cache import (HITS_KEY, INVALIDATES, MISSES_KEY, get_cache, incr,
+                    invalidate, response_key)
+from .parsers import FastJSONParser, NDJSONParser
+from .permissions import IsAdmin
 
 
 class ListCreateDestroyViewSet(
@@ -8,3 +28,155 @@ class ListCreateDestroyViewSet(
     viewsets.GenericViewSet,
 ):
     pass
+
+
+class ReplicaReadMixin:
+    """Безопасные методы читают с реплики, если клиент недавно не писал.
+
+    Успешная запись закрепляет клиента за основной базой на время
+    DB_REPLICATION_LAG, чтобы он сразу видел свои изменения.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code < 400:
+                db.pin(request, response)
+            return response
+        if db.is_pinned(request):
+            return super().dispatch(request, *args, **kwargs)
+        with db.use_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ValuesListMixin:
+    """list без ModelSerializer: ответ собирается из values().
+
+    values_class — класс из api/values.py, повторяющий вывод
+    сериализатора. Фильтры и пагинация те же, что у обычного list.
+    """
+    values_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_class is None or not settings.VALUES_FAST_PATH:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None).values(*self.values_class.fields)
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        with metrics.serializing():
+            data = self.values_class.represent(rows)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class CachedListMixin:
+    """Кэширует ответ list по полному пути запроса.
+
+    cache_namespace задаёт пространство имён для инвалидации,
+    cache_anonymous_only — кэшировать только анонимные запросы.
+    Промах заполняется с основной базы: ответ реплики, отстающей от
+    записи, иначе лёг бы под новую версию и жил бы весь
+    API_CACHE_TIMEOUT.
+    """
+    cache_namespace = None
+    cache_anonymous_only = False
+
+    def list(self, request, *args, **kwargs):
+        if self.cache_anonymous_only and request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        cache = get_cache()
+        key = response_key(self.cache_namespace, request.get_full_path())
+        data = cache.get(key)
+        if data is not None:
+            incr(HITS_KEY)
+            return Response(data, headers={'X-Cache': 'HIT'})
+        incr(MISSES_KEY)
+        with db.use_primary():
+            response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified для list и retrieve по версии тайтла.
+
+    Валидатор берётся из Title.version одним запросом по первичному
+    ключу, без сериализации страницы; при совпадении отдаётся 304.
+    """
+    title_lookup_kwarg = 'title_id'
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+    def get_validators(self, request):
+        title_id = self.kwargs.get(self.title_lookup_kwarg)
+        if title_id is None:
+            return None, None
+        state = Title.objects.filter(pk=title_id).values_list(
+            'version', 'modified'
+        ).first()
+        if state is None:
+            return None, None
+        version, modified = state
+        representation = (
+            f'{title_id}:{version}:{request.get_full_path()}:'
+            f'{request.accepted_media_type}'
+        )
+        etag = quote_etag(hashlib.md5(representation.encode()).hexdigest())
+        return etag, timegm(modified.utctimetuple())
+
+    def conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class BulkSaveMixin:
+    """POST `<prefix>/bulk/`: массовая загрузка для администратора.
+
+    Тело — JSON-массив или NDJSON. Всё сохраняется одной транзакцией;
+    если хотя бы один элемент неверен, ответ 400 содержит ошибки
+    по номерам элементов и ничего не записывается.
+    bulk_save — функция из api/bulk.py, сохраняющая список элементов.
+    """
+    bulk_save = None
+
+    @action(
+        detail=False, methods=('post',), url_path='bulk',
+        permission_classes=(IsAuthenticated, IsAdmin),
+        parser_classes=(FastJSONParser, NDJSONParser),
+    )
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается массив объектов.')
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'Не больше {settings.BULK_MAX_ITEMS} объектов за запрос.'
+            )
+        try:
+            with transaction.atomic():
+                result = self.bulk_save(items)
+        except BulkError as error:
+            return Response(
+                {'errors': error.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+        # bulk_create и bulk_update не отправляют сигналы.
+        invalidate(*INVALIDATES[self.get_queryset().model])
+        return Response(result, status=status.HTTP_201_CREATED)
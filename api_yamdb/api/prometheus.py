@@ -0,0 +1,178 @@
+"""Метрики в текстовом формате Prometheus.
+
+Каждый процесс копит счётчики в памяти и не чаще раза в
+METRICS_FLUSH_INTERVAL секунд сбрасывает их в свой файл
+`<pid>.json` в каталоге METRICS_DIR. При сборе метрик файлы всех
+процессов суммируются, поэтому любой воркер отдаёт общие итоги.
+Без METRICS_DIR метрики видны только внутри процесса.
+"""
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'),
+)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, float('inf'))
+
+# Имя -> (тип, описание). Порядок задаёт порядок вывода.
+METRICS = {
+    'yamdb_http_requests_total': (
+        'counter', 'HTTP requests by route, method and status.'),
+    'yamdb_http_request_duration_seconds': (
+        'histogram', 'Request latency by route and status.'),
+    'yamdb_db_queries_per_request': (
+        'histogram', 'SQL queries per sampled request by route.'),
+    'yamdb_jwt_auth_failures_total': (
+        'counter', 'Rejected JWT tokens by reason.'),
+    'yamdb_api_cache_hits_total': (
+        'counter', 'Catalogue response cache hits.'),
+    'yamdb_api_cache_misses_total': (
+        'counter', 'Catalogue response cache misses.'),
+    'yamdb_email_outbox_pending': (
+        'gauge', 'Emails waiting in the outbox.'),
+}
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def sample_name(name, labels):
+    if not labels:
+        return name
+    pairs = ','.join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'),
+        )
+        for key, value in labels
+    )
+    return f'{name}{{{pairs}}}'
+
+
+class Registry:
+    """Значения сэмплов процесса с периодическим сбросом в файл."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.flushed = 0.0
+
+    def inc(self, name, value=1, **labels):
+        key = sample_name(name, sorted(labels.items()))
+        with self.lock:
+            self.samples[key] = self.samples.get(key, 0) + value
+        self.flush_if_due()
+
+    def observe(self, name, value, buckets, **labels):
+        """Наблюдение гистограммы: накопительные бакеты, _sum и _count."""
+        labels = sorted(labels.items())
+        with self.lock:
+            for bound in buckets:
+                if value <= bound:
+                    key = sample_name(
+                        f'{name}_bucket',
+                        labels + [('le', format_value(bound))],
+                    )
+                    self.samples[key] = self.samples.get(key, 0) + 1
+            for suffix, delta in (('_sum', value), ('_count', 1)):
+                key = sample_name(name + suffix, labels)
+                self.samples[key] = self.samples.get(key, 0) + delta
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        directory = getattr(settings, 'METRICS_DIR', None)
+        now = time.monotonic()
+        if not directory or now - self.flushed < getattr(
+            settings, 'METRICS_FLUSH_INTERVAL', 1
+        ):
+            return
+        self.flushed = now
+        self.flush(directory)
+
+    def flush(self, directory):
+        with self.lock:
+            data = json.dumps(self.samples)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as output:
+            output.write(data)
+        os.replace(path, os.path.join(directory, f'{os.getpid()}.json'))
+
+    def collect(self):
+        """Сумма сэмплов всех процессов, писавших в METRICS_DIR."""
+        with self.lock:
+            totals = dict(self.samples)
+        directory = getattr(settings, 'METRICS_DIR', None)
+        if not directory:
+            return totals
+        own = os.path.join(directory, f'{os.getpid()}.json')
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            if path == own:
+                continue
+            try:
+                with open(path) as source:
+                    samples = json.load(source)
+            except (OSError, ValueError):
+                # Файл удалили или процесс ещё не дописал его.
+                continue
+            for key, value in samples.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+
+
+registry = Registry()
+
+
+def family(key):
+    name = key.split('{', 1)[0]
+    if name in METRICS:
+        return name
+    for suffix in ('_bucket', '_sum', '_count'):
+        if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+            return name[:-len(suffix)]
+    return name
+
+
+def sort_key(sample):
+    """Бакеты гистограммы — по возрастанию границы le."""
+    key = sample[0]
+    if 'le="' not in key:
+        return key, 0.0
+    prefix, rest = key.split('le="', 1)
+    return prefix, float(rest.split('"', 1)[0])
+
+
+def render(extra=None):
+    """Текст в формате exposition 0.0.4.
+
+    extra — сэмплы, посчитанные в момент сбора (очередь писем, кэш).
+    """
+    samples = registry.collect()
+    samples.update(extra or {})
+    families = {}
+    for key, value in samples.items():
+        families.setdefault(family(key), []).append((key, value))
+    lines = []
+    for name, (kind, description) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for key, value in sorted(families.get(name, ()), key=sort_key):
+            lines.append(f'{key} {format_value(value)}')
+    return '\n'.join(lines) + '\n'
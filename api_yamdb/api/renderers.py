@@ -0,0 +1,45 @@
+"""JSON-рендерер на orjson с откатом на stdlib json.
+
+Бэкенд выбирается настройкой API_JSON_BACKEND: 'orjson' (если пакет
+установлен) или 'json'. Вывод совпадает с JSONRenderer DRF: даты и
+Decimal проходят через тот же encoder, U+2028/U+2029 экранируются.
+"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def use_orjson():
+    return orjson is not None and settings.API_JSON_BACKEND == 'orjson'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer, который сериализует компактный вывод через orjson.
+
+    Вывод с отступами (browsable API, `; indent=`) и всё, что orjson
+    не умеет, уходит в стандартный рендерер.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not use_orjson() or self.ensure_ascii or (
+            not self.compact
+        ) or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except (orjson.JSONEncodeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer: вывод должен быть подмножеством JavaScript.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
@@ -1,11 +1,15 @@
-from django.forms import ValidationError
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
 
 from reviews.models import Category, Comment, Genre, Review, Title, User
 
+from .metrics import TimedSerializerMixin
 
-class CommentSerializer(serializers.ModelSerializer):
+
+class TimedModelSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """ModelSerializer, время которого попадает в метрики запроса."""
+
+
+class CommentSerializer(TimedModelSerializer):
     """Сериализация комментариев к отзывам."""
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True,
@@ -16,29 +20,24 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date',)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
-    """Сериализация отзывов к тайтлам."""
+class ReviewSerializer(TimedModelSerializer):
+    """Сериализация отзывов к тайтлам.
+
+    Повторный отзыв отсекает ограничение unique_review при INSERT,
+    ReviewViewSet превращает его в ошибку DUPLICATE_ERROR.
+    """
+    DUPLICATE_ERROR = 'К этому произведению уже оставлен отзыв.'
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True,
     )
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date',)
-
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if request.method == 'POST':
-            if Review.objects.filter(title=title, author=author).exists():
-                raise ValidationError('К этому произведению'
-                                      'уже оставлен отзыв')
-        return data
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comment_count',)
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedModelSerializer):
     """Сериализация категорий."""
 
     class Meta:
@@ -50,7 +49,7 @@ class CategorySerializer(serializers.ModelSerializer):
         }
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedModelSerializer):
     """Сериализация жанров."""
 
     class Meta:
@@ -62,7 +61,7 @@ class GenreSerializer(serializers.ModelSerializer):
         }
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(TimedModelSerializer):
     """Сериализация тайтлов/произведений. Создание."""
     genre = serializers.SlugRelatedField(
         slug_field='slug',
@@ -76,26 +75,60 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = (
+            'rating', 'review_count', 'score_sum', 'version', 'modified',
+        )
 
 
-class ReadOnlyTitleSerializer(serializers.ModelSerializer):
-    """Сериализация тайтлов/произведений. Только просмотр."""
-    rating = serializers.IntegerField(
-        source='reviews__score__avg',
-        read_only=True
+class BulkTitleSerializer(serializers.ModelSerializer):
+    """Элемент массовой загрузки тайтлов. Слаги проверяются пачкой."""
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), required=False
     )
+    category = serializers.SlugField(required=False, allow_null=True)
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+
+
+class BulkGenreSerializer(serializers.ModelSerializer):
+    """Элемент массовой загрузки жанров, без запроса на уникальность."""
+
+    class Meta:
+        model = Genre
+        fields = ('name', 'slug')
+        extra_kwargs = {
+            'name': {'validators': []},
+            'slug': {'validators': []},
+        }
+
+
+class BulkCategorySerializer(serializers.ModelSerializer):
+    """Элемент массовой загрузки категорий."""
+
+    class Meta:
+        model = Category
+        fields = ('name', 'slug')
+        extra_kwargs = {'slug': {'validators': []}}
+
+
+class ReadOnlyTitleSerializer(TimedModelSerializer):
+    """Сериализация тайтлов/произведений. Только просмотр."""
+    rating = serializers.IntegerField(read_only=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
 
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+            'id', 'name', 'year', 'rating', 'review_count', 'description',
+            'genre', 'category'
         )
 
 
-class UserSignupSerializer(serializers.ModelSerializer):
+class UserSignupSerializer(TimedModelSerializer):
     """Сериализация регистрации пользователя и создания нового."""
     username = serializers.SlugField(
         max_length=150,
@@ -136,7 +169,7 @@ class TokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField()
 
 
-class UsersSettingsSerializer(serializers.ModelSerializer):
+class UsersSettingsSerializer(TimedModelSerializer):
     """Сериализация изменение/создание user администратором."""
     first_name = serializers.CharField(
         required=False, max_length=150, allow_null=True
@@ -160,7 +193,7 @@ class UsersSettingsSerializer(serializers.ModelSerializer):
         model = User
 
 
-class UserMeSerializer(serializers.ModelSerializer):
+class UserMeSerializer(TimedModelSerializer):
     """Сериализация запроса/измения своей учетной записи."""
     username = serializers.CharField(required=False)
     email = serializers.EmailField(required=False)
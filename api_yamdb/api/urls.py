@@ -1,9 +1,11 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserMeRetrieveUpdate,
-                    UserSignupViewset, UsersSettingsViewset, UserTokenViewset)
+from .views import (CacheStatsView, CategoryViewSet, CommentViewSet,
+                    ExportView, GenreViewSet, LeaderboardView,
+                    RequestStatsView, ReviewViewSet, TitleViewSet,
+                    UserMeRetrieveUpdate, UserSignupViewset,
+                    UsersSettingsViewset, UserTokenViewset)
 
 app_name = 'api'
 
@@ -28,5 +30,16 @@ urlpatterns = [
     path('v1/auth/signup/', UserSignupViewset.as_view()),
     path('v1/auth/token/', UserTokenViewset.as_view()),
     path('v1/users/me/', UserMeRetrieveUpdate.as_view()),
+    path('v1/stats/cache/', CacheStatsView.as_view()),
+    path('v1/stats/requests/', RequestStatsView.as_view()),
+    path(
+        'v1/export/<slug:dataset>.<slug:file_format>',
+        ExportView.as_view(),
+    ),
+    path('v1/leaderboards/', LeaderboardView.as_view()),
+    path(
+        'v1/leaderboards/<slug:kind>/<slug:slug>/',
+        LeaderboardView.as_view(),
+    ),
     path('v1/', include(router.urls)),
 ]
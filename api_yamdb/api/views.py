@@ -1,26 +1,47 @@
+import hashlib
+from calendar import timegm
+
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import exceptions, filters, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews import leaderboards
+from reviews.models import (Category, Comment, Genre, Leaderboard,
+                            LeaderboardEntry, Review, ScoreHistogram, Title,
+                            User)
+from reviews.outbox import enqueue_email, pending_count
+from reviews.services import (change_comment_count, change_review_score,
+                              delete_user, rating_summary,
+                              touch_review_title)
 
-from .filters import TitlesFilter
-from .mixins import ListCreateDestroyViewSet
+from . import bulk, export, prometheus
+from .authentication import UserAccessToken
+from .cache import get_stats
+from .filters import TitlesFilter, TitlesOrderingFilter
+from .metrics import histogram
+from .mixins import (BulkSaveMixin, CachedListMixin, ConditionalGetMixin,
+                     ListCreateDestroyViewSet, ReplicaReadMixin,
+                     ValuesListMixin)
+from .pagination import LimitOffsetOrCursorPagination
 from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrAdminOrModerator
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, ReadOnlyTitleSerializer,
                           ReviewSerializer, TitleSerializer, TokenSerializer,
                           UserMeSerializer, UserSignupSerializer,
                           UsersSettingsSerializer)
+from .values import CommentValues, ReviewValues, TitleValues
 from api_yamdb.settings import DEFAULT_FROM_EMAIL
 
 
@@ -29,13 +50,14 @@ class UserMeRetrieveUpdate(APIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request):
-        user = get_object_or_404(User, email=request.user)
+        user = get_object_or_404(User, pk=request.user.pk)
         serializer = UsersSettingsSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def patch(self, request):
+        # request.user собран из токена и содержит не все поля.
         serializer = UserMeSerializer(
-            request.user,
+            get_object_or_404(User, pk=request.user.pk),
             data=request.data,
             partial=True
         )
@@ -55,6 +77,9 @@ class UsersSettingsViewset(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
 
+    def perform_destroy(self, instance):
+        delete_user(instance)
+
 
 class UserSignupViewset(APIView):
     """Регистрация нового пользователя, получение кода."""
@@ -62,12 +87,7 @@ class UserSignupViewset(APIView):
 
     def tokensend(self, user, username, email):
         token = default_token_generator.make_token(user)
-        send_mail(
-            'confirmation_code',
-            token,
-            DEFAULT_FROM_EMAIL,
-            (email,)
-        )
+        enqueue_email(email, 'confirmation_code', token, DEFAULT_FROM_EMAIL)
 
     def post(self, request):
         serializer = UserSignupSerializer(data=request.data)
@@ -87,6 +107,126 @@ class UserSignupViewset(APIView):
         )
 
 
+class CacheStatsView(APIView):
+    """Счётчики попаданий и промахов кэша ответов."""
+    permission_classes = (IsAuthenticated, IsAdmin)
+
+    def get(self, request):
+        return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+class RequestStatsView(APIView):
+    """Агрегированные метрики запросов по вьюхам этого процесса."""
+    permission_classes = (IsAuthenticated, IsAdmin)
+
+    def get(self, request):
+        return Response(histogram.snapshot(), status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    """Метрики всех воркеров в текстовом формате Prometheus."""
+    permission_classes = (IsAuthenticated, IsAdmin)
+
+    def get(self, request):
+        stats = get_stats()
+        text = prometheus.render({
+            'yamdb_api_cache_hits_total': stats['hits'],
+            'yamdb_api_cache_misses_total': stats['misses'],
+            'yamdb_email_outbox_pending': pending_count(),
+        })
+        return HttpResponse(text, content_type=prometheus.CONTENT_TYPE)
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка набора данных: `<набор>.csv` или `.ndjson`."""
+    permission_classes = (IsAuthenticated, IsAdmin)
+
+    def get(self, request, dataset, file_format):
+        if dataset not in export.DATASETS or (
+            file_format not in export.CONTENT_TYPES
+        ):
+            raise Http404
+        response = StreamingHttpResponse(
+            export.stream(dataset, file_format),
+            content_type=export.CONTENT_TYPES[file_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{file_format}"'
+        )
+        return response
+
+
+class LeaderboardView(ReplicaReadMixin, APIView):
+    """Топ тайтлов: общий, `genres/<slug>/` или `categories/<slug>/`.
+
+    Доска читается готовой из таблицы; ETag и Last-Modified берутся
+    из версии доски, Cache-Control разрешает кэш на
+    LEADERBOARD_CACHE_MAX_AGE секунд.
+    """
+    permission_classes = (AllowAny,)
+    kinds = {
+        'genres': (Genre, leaderboards.GENRE),
+        'categories': (Category, leaderboards.CATEGORY),
+    }
+
+    def get_key(self, kind, slug):
+        if kind is None:
+            return leaderboards.OVERALL
+        if kind not in self.kinds:
+            raise Http404
+        model, board_kind = self.kinds[kind]
+        return leaderboards.board_key(
+            board_kind, get_object_or_404(model, slug=slug).pk
+        )
+
+    def get(self, request, kind=None, slug=None):
+        key = self.get_key(kind, slug)
+        board = Leaderboard.objects.filter(key=key).values(
+            'pk', 'version', 'refreshed'
+        ).first()
+        if board is None:
+            # Доска появится при следующем refresh_leaderboards.
+            return Response({'refreshed': None, 'results': []})
+        etag = quote_etag(hashlib.md5(
+            f'{key}:{board["version"]}:{request.accepted_media_type}'
+            .encode()
+        ).hexdigest())
+        last_modified = timegm(board['refreshed'].utctimetuple())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = Response({
+                'refreshed': board['refreshed'],
+                'results': self.get_results(board['pk']),
+            })
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(
+            response, public=True,
+            max_age=settings.LEADERBOARD_CACHE_MAX_AGE,
+        )
+        return response
+
+    def get_results(self, board_id):
+        return [
+            {
+                'id': row['title_id'],
+                'name': row['title__name'],
+                'year': row['title__year'],
+                'rating': row['title__rating'],
+                'review_count': row['title__review_count'],
+                'score': row['score'],
+            }
+            for row in LeaderboardEntry.objects.filter(
+                leaderboard_id=board_id
+            ).values(
+                'title_id', 'title__name', 'title__year', 'title__rating',
+                'title__review_count', 'score',
+            )
+        ]
+
+
 class UserTokenViewset(APIView):
     """Получение токена по коду."""
     permission_classes = (AllowAny,)
@@ -100,7 +240,7 @@ class UserTokenViewset(APIView):
             user,
             request.data['confirmation_code']
         ):
-            token = AccessToken.for_user(user)
+            token = UserAccessToken.for_user(user)
             return Response(
                 {'token': str(token)}, status=status.HTTP_200_OK
             )
@@ -110,25 +250,51 @@ class UserTokenViewset(APIView):
         )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, CachedListMixin, ConditionalGetMixin,
+                   BulkSaveMixin, ValuesListMixin, viewsets.ModelViewSet):
     """Вьюсет для произведения/тайтла."""
-    queryset = Title.objects.all().annotate(Avg('reviews__score'))
+    values_class = TitleValues
+    cache_namespace = 'titles'
+    cache_anonymous_only = True
+    title_lookup_kwarg = 'pk'
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     serializer_class = TitleSerializer
     pagination_class = LimitOffsetPagination
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitlesOrderingFilter)
     filterset_class = TitlesFilter
     permission_classes = (
         IsAdminOrReadOnly,
     )
+    bulk_save = staticmethod(bulk.save_titles)
 
     def get_serializer_class(self):
         if self.action in ('retrieve', 'list'):
             return ReadOnlyTitleSerializer
         return TitleSerializer
 
+    @action(detail=True, methods=('get',), url_path='rating')
+    def rating(self, request, pk=None):
+        """Распределение оценок тайтла, средняя и медиана."""
+        return self.conditional(self.get_rating, request, pk=pk)
+
+    def get_rating(self, request, pk=None):
+        histogram = ScoreHistogram.objects.filter(title_id=pk).first()
+        if histogram is None:
+            # Отзывов ещё не было — строка распределения не создана.
+            histogram = ScoreHistogram(title=get_object_or_404(Title, pk=pk))
+        counts = histogram.counts()
+        return Response({
+            'scores': {str(score): count for score, count in counts.items()},
+            **rating_summary(counts),
+        })
 
-class GenreViewSet(ListCreateDestroyViewSet):
+
+class GenreViewSet(ReplicaReadMixin, CachedListMixin, BulkSaveMixin,
+                   ListCreateDestroyViewSet):
     """Вьюсет для жанров."""
+    cache_namespace = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     pagination_class = LimitOffsetPagination
@@ -138,10 +304,13 @@ class GenreViewSet(ListCreateDestroyViewSet):
     permission_classes = (
         IsAdminOrReadOnly,
     )
+    bulk_save = staticmethod(bulk.save_genres)
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(ReplicaReadMixin, CachedListMixin, BulkSaveMixin,
+                      ListCreateDestroyViewSet):
     """Вьюсет для категорий."""
+    cache_namespace = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     pagination_class = LimitOffsetPagination
@@ -151,11 +320,14 @@ class CategoryViewSet(ListCreateDestroyViewSet):
     permission_classes = (
         IsAdminOrReadOnly,
     )
+    bulk_save = staticmethod(bulk.save_categories)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
-    pagination_class = LimitOffsetPagination
+    values_class = ReviewValues
+    pagination_class = LimitOffsetOrCursorPagination
     permission_classes = (IsAuthorOrAdminOrModerator,)
 
     def get_queryset(self):
@@ -163,16 +335,46 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return title.reviews.all()
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        if self.request.user.reviews.filter(title=title_id).exists():
-            raise ValidationError('К этому произведению уже оставлен отзыв.')
-        serializer.save(author=self.request.user, title=title)
+        title_id = int(self.kwargs.get('title_id'))
+        if not Title.objects.filter(pk=title_id).exists():
+            raise Http404
+        try:
+            with transaction.atomic():
+                review = serializer.save(
+                    author=self.request.user, title_id=title_id
+                )
+                change_review_score(title_id, new_score=review.score)
+        except IntegrityError:
+            # Повтор ловит unique_review; другие нарушения не скрываем.
+            if not Review.objects.filter(
+                author=self.request.user, title_id=title_id
+            ).exists():
+                raise
+            raise exceptions.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    ReviewSerializer.DUPLICATE_ERROR
+                ],
+            })
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            old_score = Review.objects.select_for_update().values_list(
+                'score', flat=True
+            ).get(pk=serializer.instance.pk)
+            review = serializer.save()
+            change_review_score(review.title_id, old_score, review.score)
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            change_review_score(instance.title_id, old_score=instance.score)
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
-    pagination_class = LimitOffsetPagination
+    values_class = CommentValues
+    pagination_class = LimitOffsetOrCursorPagination
     permission_classes = (IsAuthorOrAdminOrModerator,)
 
     def get_queryset(self):
@@ -184,7 +386,19 @@ class CommentViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.is_valid(raise_exception=True)
         if get_object_or_404(Review, id=self.kwargs.get('review_id')):
-            serializer.save(
-                author=self.request.user,
-                review_id=self.kwargs.get('review_id')
-            )
+            with transaction.atomic():
+                comment = serializer.save(
+                    author=self.request.user,
+                    review_id=self.kwargs.get('review_id')
+                )
+                change_comment_count(comment.review_id, 1)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            comment = serializer.save()
+            touch_review_title(comment.review_id)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            change_comment_count(instance.review_id, -1)
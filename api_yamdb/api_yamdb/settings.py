@@ -23,6 +23,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -32,6 +33,15 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Доля запросов, для которых собираются метрики (0 — выключено).
+REQUEST_METRICS_SAMPLE_RATE = float(
+    os.getenv('REQUEST_METRICS_SAMPLE_RATE', '1')
+)
+
+# Каталог, через который воркеры суммируют метрики /metrics.
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 1
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
@@ -53,13 +63,74 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
-DATABASES = {
+# Профиль БД задаётся окружением: DB_ENGINE=postgresql или sqlite.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+# Перед запросом проверять, что постоянное соединение живо.
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', '1') == '1'
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'api_yamdb'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        }
+    }
+    if os.getenv('DB_REPLICA_HOST'):
+        DATABASES['replica'] = dict(
+            DATABASES['default'], HOST=os.getenv('DB_REPLICA_HOST'),
+            TEST={'MIRROR': 'default'},
+        )
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            # Сколько секунд ждать снятия блокировки записи.
+            'OPTIONS': {'timeout': 20},
+        }
+    }
+    if os.getenv('DB_REPLICA_NAME'):
+        DATABASES['replica'] = dict(
+            DATABASES['default'], NAME=os.getenv('DB_REPLICA_NAME'),
+            TEST={'MIRROR': 'default'},
+        )
+
+# Применяются к каждому новому соединению с SQLite.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 ** 2))),
+    # Отрицательное значение — размер в КиБ.
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-64000')),
+}
+
+# GET и HEAD каталога и отзывов читают с реплик (алиасы replica*).
+DATABASE_ROUTERS = ['api.db.ReplicaRouter']
+# Сколько секунд после записи клиент читает с основной базы.
+DB_REPLICATION_LAG = float(os.getenv('DB_REPLICATION_LAG', '5'))
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
     }
 }
 
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 60 * 5
+# Сколько секунд версия токенов пользователя живёт в кэше. С кэшем
+# в памяти процесса другие воркеры увидят отзыв токена не сразу.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -95,6 +166,28 @@ RECIPIENTS_EMAIL = ['manager@apiyambd.com']
 DEFAULT_FROM_EMAIL = 'admin@apiyambd.com'
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# JSON API: 'orjson' (если установлен) или стандартный 'json'.
+API_JSON_BACKEND = os.getenv('API_JSON_BACKEND', 'orjson')
+
+# list тайтлов, отзывов и комментариев собирается из values().
+VALUES_FAST_PATH = True
+
+# Предел элементов в одном запросе к `<prefix>/bulk/`.
+BULK_MAX_ITEMS = 10000
+# Сколько строк выгрузки читается из БД и отправляется за раз.
+EXPORT_CHUNK_SIZE = 2000
+
+# Доски лидеров: тайтлов на доске, вес априорной средней в байесовской
+# оценке (0 — обычная средняя) и max-age ответа.
+LEADERBOARD_SIZE = 20
+LEADERBOARD_PRIOR_WEIGHT = int(os.getenv('LEADERBOARD_PRIOR_WEIGHT', '10'))
+LEADERBOARD_CACHE_MAX_AGE = 60
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# На сколько секунд забранное воркером письмо скрыто от других воркеров.
+EMAIL_OUTBOX_LEASE = 300
 
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
@@ -102,8 +195,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
 }
 
@@ -0,0 +1,216 @@
+"""Доски лидеров: общий топ тайтлов и топы по жанрам и категориям.
+
+Тайтлы ранжируются по байесовской средней
+(C * m + сумма оценок) / (C + число отзывов), где m — средняя оценка
+по всем отзывам, а C — LEADERBOARD_PRIOR_WEIGHT. Тайтл с парой отзывов
+тянется к общей средней и не обгоняет тайтлы с сотнями отзывов.
+
+Доски целиком пересчитывает команда refresh_leaderboards, она же
+обновляет m. Между пересчётами отзыв меняет оценку своего тайтла на его
+досках и пересортировывает не больше LEADERBOARD_SIZE мест в памяти.
+Запрос к тайтлам нужен, только когда тайтл опустился ниже последнего
+места полной доски или ушёл с неё: его место мог занять тайтл вне доски.
+"""
+from itertools import groupby
+
+from django.conf import settings
+from django.db.models import ExpressionWrapper, F, FloatField, Sum, Value
+from django.utils import timezone
+
+from reviews.models import (Category, Genre, Leaderboard, LeaderboardEntry,
+                            Title)
+
+OVERALL = 'all'
+GENRE = 'genre'
+CATEGORY = 'category'
+
+
+def board_key(kind, group_id):
+    return f'{kind}:{group_id}'
+
+
+def board_keys():
+    """Ключи всех досок: общая, по каждому жанру и категории."""
+    return [
+        OVERALL,
+        *(board_key(GENRE, pk)
+          for pk in Genre.objects.values_list('pk', flat=True)),
+        *(board_key(CATEGORY, pk)
+          for pk in Category.objects.values_list('pk', flat=True)),
+    ]
+
+
+def title_board_keys(title_id, category_id):
+    keys = [OVERALL]
+    if category_id is not None:
+        keys.append(board_key(CATEGORY, category_id))
+    keys.extend(
+        board_key(GENRE, genre_id)
+        for genre_id in Title.genre.through.objects.filter(
+            title_id=title_id
+        ).values_list('genre_id', flat=True)
+    )
+    return keys
+
+
+def titles_for(key):
+    if key == OVERALL:
+        return Title.objects.all()
+    kind, group_id = key.split(':')
+    if kind == GENRE:
+        return Title.objects.filter(genre=group_id)
+    return Title.objects.filter(category_id=group_id)
+
+
+def prior_mean():
+    """Средняя оценка по всем отзывам из счётчиков тайтлов."""
+    totals = Title.objects.aggregate(
+        scores=Sum('score_sum'), count=Sum('review_count')
+    )
+    if not totals['count']:
+        return 0.0
+    return totals['scores'] / totals['count']
+
+
+def bayesian_score(score_sum, review_count, mean):
+    weight = settings.LEADERBOARD_PRIOR_WEIGHT
+    return (weight * mean + score_sum) / (weight + review_count)
+
+
+def score_expression(mean):
+    weight = settings.LEADERBOARD_PRIOR_WEIGHT
+    return ExpressionWrapper(
+        (Value(weight * mean) + F('score_sum'))
+        / (Value(float(weight)) + F('review_count')),
+        output_field=FloatField(),
+    )
+
+
+def rebuild(board, mean):
+    """Перезаписывает места доски запросом с LIMIT по счётчикам тайтлов."""
+    top = titles_for(board.key).filter(review_count__gt=0).annotate(
+        leaderboard_score=score_expression(mean)
+    ).order_by(
+        '-leaderboard_score', '-review_count', '-pk'
+    ).values_list('pk', 'leaderboard_score')[:settings.LEADERBOARD_SIZE]
+    board.entries.all().delete()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(
+            leaderboard=board, position=position,
+            title_id=title_id, score=score,
+        )
+        for position, (title_id, score) in enumerate(top, 1)
+    )
+    Leaderboard.objects.filter(pk=board.pk).update(
+        prior_mean=mean, version=F('version') + 1, refreshed=timezone.now()
+    )
+
+
+def refresh_leaderboards():
+    """Полный пересчёт всех досок; возвращает их число."""
+    mean = prior_mean()
+    keys = board_keys()
+    Leaderboard.objects.exclude(key__in=keys).delete()
+    existing = {board.key: board for board in Leaderboard.objects.all()}
+    for key in keys:
+        board = existing.get(key) or Leaderboard.objects.create(key=key)
+        rebuild(board, mean)
+    return len(keys)
+
+
+def entry_order(entry):
+    """Ключ сортировки места (title_id, оценка, число отзывов).
+
+    Совпадает с ORDER BY в rebuild(), места идут по убыванию ключа.
+    """
+    title_id, score, review_count = entry
+    return score, review_count, title_id
+
+
+def place(entries, title_id, score, review_count):
+    """Места доски после изменения оценки тайтла.
+
+    entries — текущие места по убыванию, score — новая оценка тайтла
+    или None, если отзывов не осталось. Возвращает entries, если доска
+    не изменилась, и None, если её нужно перестроить запросом.
+    Неполная доска содержит все тайтлы группы с отзывами.
+    """
+    full = len(entries) >= settings.LEADERBOARD_SIZE
+    others = [entry for entry in entries if entry[0] != title_id]
+    on_board = len(others) != len(entries)
+    if score is None:
+        if not on_board:
+            return entries
+        return None if full else others
+    entry = (title_id, score, review_count)
+    if full and entry_order(entry) < entry_order(entries[-1]):
+        return None if on_board else entries
+    return sorted(
+        [*others, entry], key=entry_order, reverse=True
+    )[:settings.LEADERBOARD_SIZE]
+
+
+def save_places(places):
+    """Записывает места нескольких досок: {доска: места}."""
+    if not places:
+        return
+    LeaderboardEntry.objects.filter(leaderboard__in=list(places)).delete()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(
+            leaderboard=board, position=position,
+            title_id=title_id, score=score,
+        )
+        for board, entries in places.items()
+        for position, (title_id, score, _) in enumerate(entries, 1)
+    )
+    boards = sorted(places, key=lambda board: board.prior_mean)
+    for mean, group in groupby(boards, key=lambda board: board.prior_mean):
+        Leaderboard.objects.filter(
+            pk__in=[board.pk for board in group]
+        ).update(
+            prior_mean=mean, version=F('version') + 1,
+            refreshed=timezone.now(),
+        )
+
+
+def title_changed(title_id):
+    """Обновляет доски тайтла после изменения его отзывов.
+
+    Вызывается в транзакции записи отзыва, после обновления счётчиков.
+    Доски, которых ещё нет, появятся при следующем refresh_leaderboards.
+    """
+    title = Title.objects.filter(pk=title_id).values(
+        'score_sum', 'review_count', 'category_id'
+    ).first()
+    if title is None:
+        return
+    boards = list(Leaderboard.objects.filter(
+        key__in=title_board_keys(title_id, title['category_id'])
+    ))
+    entries = {board.pk: [] for board in boards}
+    for board_id, *entry in LeaderboardEntry.objects.filter(
+        leaderboard__in=boards
+    ).order_by('leaderboard_id', 'position').values_list(
+        'leaderboard_id', 'title_id', 'score', 'title__review_count'
+    ):
+        entries[board_id].append(tuple(entry))
+    mean = None
+    places = {}
+    for board in boards:
+        if not board.prior_mean:
+            # Доску строили без отзывов: средняя ещё не посчитана.
+            mean = prior_mean() if mean is None else mean
+            board.prior_mean = mean
+        score = None
+        if title['review_count']:
+            score = bayesian_score(
+                title['score_sum'], title['review_count'], board.prior_mean
+            )
+        new = place(
+            entries[board.pk], title_id, score, title['review_count']
+        )
+        if new is None:
+            rebuild(board, board.prior_mean)
+        elif new is not entries[board.pk]:
+            places[board] = new
+    save_places(places)
@@ -0,0 +1,189 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.leaderboards import refresh_leaderboards
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.search import get_search_backend
+from reviews.services import (recalculate_comment_counts, recalculate_ratings,
+                              recalculate_score_histograms)
+
+DEFAULT_DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+DEFAULT_BATCH_SIZE = 1000
+
+
+def user_from_row(row):
+    return User(
+        id=row['id'],
+        username=row['username'],
+        email=row['email'],
+        role=row['role'] or User.USER,
+        bio=row['bio'],
+        first_name=row['first_name'],
+        last_name=row['last_name'],
+        password=make_password(None),
+    )
+
+
+def category_from_row(row):
+    return Category(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def genre_from_row(row):
+    return Genre(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def title_from_row(row):
+    return Title(
+        id=row['id'],
+        name=row['name'],
+        year=row['year'] or None,
+        description=row.get('description', ''),
+        category_id=row['category'] or None,
+    )
+
+
+def genre_title_from_row(row):
+    return Title.genre.through(
+        id=row['id'], title_id=row['title_id'], genre_id=row['genre_id']
+    )
+
+
+def review_from_row(row):
+    return Review(
+        id=row['id'],
+        title_id=row['title_id'],
+        author_id=row['author'],
+        text=row['text'],
+        score=row['score'],
+        pub_date=row['pub_date'],
+    )
+
+
+def comment_from_row(row):
+    return Comment(
+        id=row['id'],
+        review_id=row['review_id'],
+        author_id=row['author'],
+        text=row['text'],
+        pub_date=row['pub_date'],
+    )
+
+
+# Порядок важен: файл загружается после всех, на кого ссылаются его FK.
+IMPORT_ORDER = (
+    ('users.csv', User, user_from_row),
+    ('category.csv', Category, category_from_row),
+    ('genre.csv', Genre, genre_from_row),
+    ('titles.csv', Title, title_from_row),
+    ('genre_title.csv', Title.genre.through, genre_title_from_row),
+    ('review.csv', Review, review_from_row),
+    ('comments.csv', Comment, comment_from_row),
+)
+
+
+@contextmanager
+def keep_pub_date(*models):
+    """Отключает auto_now_add, чтобы сохранить даты из CSV."""
+    fields = [
+        model._meta.get_field('pub_date') for model in models
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def batches(rows, size):
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DEFAULT_DATA_DIR,
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном INSERT.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        for filename, _, _ in IMPORT_ORDER:
+            if not os.path.isfile(os.path.join(path, filename)):
+                raise CommandError(f'Не найден файл {filename} в {path}')
+
+        with keep_pub_date(Review, Comment):
+            for filename, model, from_row in IMPORT_ORDER:
+                self.import_file(
+                    os.path.join(path, filename), model, from_row, batch_size
+                )
+
+        started = time.monotonic()
+        with transaction.atomic():
+            recalculate_ratings()
+            recalculate_comment_counts()
+            recalculate_score_histograms()
+            refresh_leaderboards()
+        self.stdout.write(
+            f'Рейтинг, счётчики и доски лидеров пересчитаны за '
+            f'{time.monotonic() - started:.2f} с'
+        )
+        started = time.monotonic()
+        with transaction.atomic():
+            get_search_backend().rebuild()
+        self.stdout.write(
+            f'Поисковый индекс перестроен за '
+            f'{time.monotonic() - started:.2f} с'
+        )
+        self.reset_sequences()
+
+    def import_file(self, filename, model, from_row, batch_size):
+        started = time.monotonic()
+        count = 0
+        with open(filename, encoding='utf-8', newline='') as csv_file:
+            rows = (from_row(row) for row in csv.DictReader(csv_file))
+            with transaction.atomic():
+                for batch in batches(rows, batch_size):
+                    model.objects.bulk_create(batch)
+                    count += len(batch)
+        elapsed = time.monotonic() - started
+        speed = count / elapsed if elapsed else count
+        self.stdout.write(self.style.SUCCESS(
+            f'{os.path.basename(filename)}: {count} строк '
+            f'за {elapsed:.2f} с ({speed:.0f} строк/с)'
+        ))
+
+    def reset_sequences(self):
+        """Сдвигает автоинкремент после вставки строк с явными id."""
+        models = [model for _, model, _ in IMPORT_ORDER]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.services import recalculate_score_histograms
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает распределение оценок тайтлов по отзывам.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = recalculate_score_histograms()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано распределений оценок: {created}')
+        )
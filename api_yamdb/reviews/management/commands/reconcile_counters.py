@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.services import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = ('Исправляет разошедшиеся счётчики отзывов тайтлов '
+            'и комментариев отзывов.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            titles, reviews = reconcile_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено тайтлов: {titles}, отзывов: {reviews}'
+        ))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.leaderboards import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает доски лидеров: общую, по жанрам и категориям.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, пересчитывая доски по расписанию.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=300,
+            help='Пауза в секундах между пересчётами (с --loop).',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            with transaction.atomic():
+                refreshed = refresh_leaderboards()
+            self.stdout.write(
+                self.style.SUCCESS(f'Пересчитано досок лидеров: {refreshed}')
+            )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:25
+
+from django.db import migrations
+
+from reviews.search import get_search_backend
+
+
+def create_search_index(apps, schema_editor):
+    backend = get_search_backend(schema_editor.connection)
+    backend.create_index()
+    backend.rebuild()
+
+
+def drop_search_index(apps, schema_editor):
+    backend = get_search_backend(schema_editor.connection)
+    if backend.table:
+        schema_editor.execute(f'DROP TABLE IF EXISTS {backend.table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_auto_20261018_1719'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
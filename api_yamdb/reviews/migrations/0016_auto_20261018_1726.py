@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_auto_20261018_1725'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.EmailField(help_text='Email получателя', max_length=254, verbose_name='Получатель')),
+                ('from_email', models.EmailField(help_text='Email отправителя', max_length=254, verbose_name='Отправитель')),
+                ('subject', models.CharField(help_text='Тема письма', max_length=255, verbose_name='Тема письма')),
+                ('body', models.TextField(help_text='Текст письма', verbose_name='Текст письма')),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('sent', 'sent'), ('failed', 'failed')], default='pending', help_text='Статус отправки', max_length=10, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Количество попыток отправки', verbose_name='Попытки')),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now, help_text='Не отправлять раньше этого времени', verbose_name='Следующая попытка')),
+                ('last_error', models.TextField(blank=True, help_text='Текст ошибки последней попытки', verbose_name='Последняя ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата добавления')),
+                ('sent', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(fields=['status', 'next_attempt'], name='outbox_status_next_idx'),
+        ),
+    ]
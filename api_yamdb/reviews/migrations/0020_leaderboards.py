@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0019_title_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Leaderboard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='all, genre:<id> или category:<id>', max_length=50, unique=True, verbose_name='Ключ доски')),
+                ('prior_mean', models.FloatField(default=0, help_text='Средняя оценка по всем отзывам на момент пересчёта', verbose_name='Априорная средняя')),
+                ('version', models.PositiveIntegerField(default=0, help_text='Увеличивается при каждом перестроении доски', verbose_name='Версия')),
+                ('refreshed', models.DateTimeField(default=django.utils.timezone.now, help_text='Время последнего перестроения', verbose_name='Обновлена')),
+            ],
+            options={
+                'verbose_name': 'Доска лидеров',
+                'verbose_name_plural': 'Доски лидеров',
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(help_text='Место на доске, начиная с 1', verbose_name='Место')),
+                ('score', models.FloatField(help_text='Байесовская средняя тайтла при построении доски', verbose_name='Оценка')),
+                ('leaderboard', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='reviews.Leaderboard', verbose_name='Доска лидеров')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место на доске лидеров',
+                'verbose_name_plural': 'Места на досках лидеров',
+                'ordering': ('position',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('leaderboard', 'position'), name='unique_leaderboard_position'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -15,6 +16,8 @@ class User(AbstractUser):
     ]
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ('username',)
+    # Поля прав, при изменении которых отзываются выданные JWT.
+    TOKEN_REVOKING_FIELDS = ('role', 'is_staff', 'is_active')
     email = models.EmailField(
         db_index=True,
         unique=True,
@@ -34,6 +37,12 @@ class User(AbstractUser):
         verbose_name='Роль пользователя',
         help_text='Укажите роль пользователя'
     )
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия токенов',
+        help_text='Токены с другой версией считаются отозванными'
+    )
 
     class Meta:
         verbose_name = 'Пользователи'
@@ -130,8 +139,51 @@ class Title(models.Model):
         verbose_name='Категория тайтла',
         help_text='Укажите категорию тайтла'
     )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Рейтинг тайтла',
+        help_text='Средняя оценка по отзывам, пересчитывается автоматически'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов',
+        help_text='Количество отзывов, пересчитывается автоматически'
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+        help_text='Сумма оценок отзывов, пересчитывается автоматически'
+    )
+    version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия тайтла',
+        help_text='Растёт при изменении тайтла, его отзывов и комментариев'
+    )
+    modified = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name='Дата изменения',
+        help_text='Время последнего изменения тайтла, отзывов и комментариев'
+    )
 
     class Meta:
+        indexes = (
+            models.Index(fields=('category', 'year'),
+                         name='title_category_year_idx'),
+            # Сортировки списка тайтлов (?ordering=).
+            models.Index(fields=('rating',), name='title_rating_idx'),
+            models.Index(fields=('category', 'rating'),
+                         name='title_category_rating_idx'),
+            models.Index(fields=('review_count',),
+                         name='title_review_count_idx'),
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(fields=('name',), name='title_name_idx'),
+        )
         verbose_name = 'Тайтлы'
         verbose_name_plural = 'Тайтлы'
 
@@ -165,11 +217,21 @@ class Review(models.Model):
         ])
     pub_date = models.DateTimeField(
         verbose_name='Дата добавления', auto_now_add=True, db_index=True)
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+        help_text='Количество комментариев, пересчитывается автоматически'
+    )
 
     class Meta:
         constraints = (
             models.UniqueConstraint(fields=('author', 'title'),
                                     name='unique_review'),)
+        indexes = (
+            models.Index(fields=('title', 'pub_date'),
+                         name='review_title_pub_date_idx'),
+        )
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
@@ -198,8 +260,213 @@ class Comment(models.Model):
         verbose_name='Дата добавления', auto_now_add=True, db_index=True)
 
     class Meta:
+        indexes = (
+            models.Index(fields=('review', 'pub_date'),
+                         name='comment_review_pub_date_idx'),
+        )
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return self.text[:15]
+
+
+class ScoreHistogram(models.Model):
+    """Число отзывов тайтла с каждой оценкой от 1 до 10.
+
+    Обновляется вместе с отзывами, поэтому распределение оценок
+    читается одной строкой.
+    """
+    SCORES = range(1, 11)
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_histogram',
+        verbose_name='Произведение',
+        help_text='Произведение, к которому относится распределение'
+    )
+    score_1 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 1'
+    )
+    score_2 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 2'
+    )
+    score_3 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 3'
+    )
+    score_4 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 4'
+    )
+    score_5 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 5'
+    )
+    score_6 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 6'
+    )
+    score_7 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 7'
+    )
+    score_8 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 8'
+    )
+    score_9 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 9'
+    )
+    score_10 = models.PositiveIntegerField(
+        default=0, verbose_name='Оценок 10'
+    )
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    @staticmethod
+    def field(score):
+        return f'score_{score}'
+
+    def counts(self):
+        return {
+            score: getattr(self, self.field(score)) for score in self.SCORES
+        }
+
+    def __str__(self):
+        return str(self.title_id)
+
+
+class Leaderboard(models.Model):
+    """Топ тайтлов: общий (`all`), жанра (`genre:<id>`) или категории."""
+    key = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name='Ключ доски',
+        help_text='all, genre:<id> или category:<id>'
+    )
+    prior_mean = models.FloatField(
+        default=0,
+        verbose_name='Априорная средняя',
+        help_text='Средняя оценка по всем отзывам на момент пересчёта'
+    )
+    version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Версия',
+        help_text='Увеличивается при каждом перестроении доски'
+    )
+    refreshed = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Обновлена',
+        help_text='Время последнего перестроения'
+    )
+
+    class Meta:
+        verbose_name = 'Доска лидеров'
+        verbose_name_plural = 'Доски лидеров'
+
+    def __str__(self):
+        return self.key
+
+
+class LeaderboardEntry(models.Model):
+    """Место тайтла на доске лидеров."""
+    leaderboard = models.ForeignKey(
+        Leaderboard,
+        on_delete=models.CASCADE,
+        related_name='entries',
+        verbose_name='Доска лидеров'
+    )
+    position = models.PositiveSmallIntegerField(
+        verbose_name='Место',
+        help_text='Место на доске, начиная с 1'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Произведение'
+    )
+    score = models.FloatField(
+        verbose_name='Оценка',
+        help_text='Байесовская средняя тайтла при построении доски'
+    )
+
+    class Meta:
+        ordering = ('position',)
+        constraints = (
+            models.UniqueConstraint(fields=('leaderboard', 'position'),
+                                    name='unique_leaderboard_position'),)
+        verbose_name = 'Место на доске лидеров'
+        verbose_name_plural = 'Места на досках лидеров'
+
+    def __str__(self):
+        return f'{self.leaderboard_id}:{self.position}'
+
+
+class OutgoingEmail(models.Model):
+    """Очередь исходящих писем."""
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'pending'),
+        (SENT, 'sent'),
+        (FAILED, 'failed'),
+    ]
+    recipient = models.EmailField(
+        max_length=254,
+        verbose_name='Получатель',
+        help_text='Email получателя'
+    )
+    from_email = models.EmailField(
+        max_length=254,
+        verbose_name='Отправитель',
+        help_text='Email отправителя'
+    )
+    subject = models.CharField(
+        max_length=255,
+        verbose_name='Тема письма',
+        help_text='Тема письма'
+    )
+    body = models.TextField(
+        verbose_name='Текст письма',
+        help_text='Текст письма'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Статус',
+        help_text='Статус отправки'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки',
+        help_text='Количество попыток отправки'
+    )
+    next_attempt = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка',
+        help_text='Не отправлять раньше этого времени'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка',
+        help_text='Текст ошибки последней попытки'
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата добавления', auto_now_add=True)
+    sent = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки'
+    )
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('status', 'next_attempt'),
+                         name='outbox_status_next_idx'),
+        )
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,116 @@
+"""Очередь исходящих писем: запись в запросе, отправка воркером."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+
+
+def enqueue_email(recipient, subject, body, from_email=None):
+    """Ставит письмо в очередь; SMTP в запросе не вызывается."""
+    return OutgoingEmail.objects.create(
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def register_failure(email, error, max_attempts):
+    email.last_error = repr(error)
+    if email.attempts >= max_attempts:
+        email.status = OutgoingEmail.FAILED
+    else:
+        email.next_attempt = timezone.now() + retry_delay(email.attempts)
+
+
+def claim_batch(batch_size):
+    """Забирает пачку готовых писем короткой транзакцией.
+
+    attempts увеличивается сразу, а next_attempt сдвигается на
+    EMAIL_OUTBOX_LEASE: пока идёт отправка, другие воркеры эти письма
+    не берут, а если воркер упадёт, письма вернутся в очередь.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.PENDING, next_attempt__lte=now)
+            .order_by('next_attempt', 'id')[:batch_size]
+        )
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt = now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE
+            )
+        OutgoingEmail.objects.bulk_update(
+            emails, ('attempts', 'next_attempt')
+        )
+    return emails
+
+
+def deliver(emails, max_attempts):
+    """Отправляет письма через одно SMTP-соединение, вне транзакции.
+
+    Результат записывается в поля писем; возвращает число отправленных.
+    """
+    sent = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            register_failure(email, error, max_attempts)
+        return sent
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email,
+                (email.recipient,), connection=connection,
+            )
+            try:
+                connection.send_messages((message,))
+            except Exception as error:
+                register_failure(email, error, max_attempts)
+            else:
+                sent += 1
+                email.status = OutgoingEmail.SENT
+                email.sent = timezone.now()
+                email.last_error = ''
+    finally:
+        connection.close()
+    return sent
+
+
+def send_pending(batch_size=None, max_attempts=None):
+    """Отправляет пачку готовых писем через одно SMTP-соединение.
+
+    Пачка забирается и результаты записываются отдельными короткими
+    транзакциями; SMTP идёт без открытой транзакции и не держит
+    блокировку базы. Возвращает кортеж (отправлено, с ошибкой).
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+    sent = deliver(emails, max_attempts)
+    with transaction.atomic():
+        OutgoingEmail.objects.bulk_update(
+            emails, ('status', 'next_attempt', 'last_error', 'sent')
+        )
+    return sent, len(emails) - sent
+
+
+def pending_count():
+    return OutgoingEmail.objects.filter(status=OutgoingEmail.PENDING).count()
@@ -0,0 +1,205 @@
+"""Полнотекстовый поиск по тайтлам.
+
+Индекс хранится в отдельной таблице, которую ведёт бэкенд под текущую
+СУБД: FTS5 для SQLite и tsvector с GIN-индексом для PostgreSQL.
+Бэкенд можно переопределить настройкой TITLE_SEARCH_BACKEND
+(путь к классу).
+"""
+import re
+
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+WORD_RE = re.compile(r'\w+')
+
+
+class IcontainsSearchBackend:
+    """Запасной вариант без индекса: поиск подстрокой."""
+    table = None
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create_index(self):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def index(self, title):
+        pass
+
+    def index_many(self, title_ids):
+        pass
+
+    def remove(self, title_id):
+        pass
+
+    def search(self, queryset, query):
+        for word in WORD_RE.findall(query):
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset
+
+    def execute(self, sql, params=()):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
+class SqliteFTSSearchBackend(IcontainsSearchBackend):
+    """Индекс на виртуальной таблице SQLite FTS5, rowid = id тайтла."""
+    table = 'reviews_title_fts'
+
+    def create_index(self):
+        self.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} '
+            'USING fts5(name, description)'
+        )
+
+    def rebuild(self):
+        self.execute(f'DELETE FROM {self.table}')
+        self.execute(
+            f'INSERT INTO {self.table} (rowid, name, description) '
+            'SELECT id, name, description FROM reviews_title'
+        )
+
+    def index(self, title):
+        self.remove(title.pk)
+        self.execute(
+            f'INSERT INTO {self.table} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            (title.pk, title.name, title.description),
+        )
+
+    def index_many(self, title_ids):
+        placeholders = ', '.join(['%s'] * len(title_ids))
+        self.execute(
+            f'DELETE FROM {self.table} WHERE rowid IN ({placeholders})',
+            title_ids,
+        )
+        self.execute(
+            f'INSERT INTO {self.table} (rowid, name, description) '
+            'SELECT id, name, description FROM reviews_title '
+            f'WHERE id IN ({placeholders})',
+            title_ids,
+        )
+
+    def remove(self, title_id):
+        self.execute(
+            f'DELETE FROM {self.table} WHERE rowid = %s', (title_id,)
+        )
+
+    def search(self, queryset, query):
+        words = WORD_RE.findall(query)
+        if not words:
+            return queryset.none()
+        match = ' '.join(f'"{word}"*' for word in words)
+        # bm25() отрицателен: чем меньше значение, тем релевантнее.
+        rank = RawSQL(
+            f'SELECT -bm25({self.table}, 10.0, 1.0) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = reviews_title.id',
+            (match,), output_field=FloatField(),
+        )
+        # RawSQL внутри __in оборачивается в скалярный подзапрос,
+        # поэтому фильтр задаётся через extra().
+        return queryset.extra(
+            where=[
+                f'reviews_title.id IN (SELECT rowid FROM {self.table} '
+                f'WHERE {self.table} MATCH %s)'
+            ],
+            params=(match,),
+        ).annotate(search_rank=rank).order_by('-search_rank', 'pk')
+
+
+class PostgresSearchBackend(IcontainsSearchBackend):
+    """Индекс на колонке tsvector с GIN-индексом."""
+    table = 'reviews_title_search'
+    config = 'russian'
+    document = (
+        "setweight(to_tsvector(%s::regconfig, name), 'A') || "
+        "setweight(to_tsvector(%s::regconfig, description), 'B')"
+    )
+
+    def create_index(self):
+        self.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'title_id integer PRIMARY KEY '
+            'REFERENCES reviews_title (id) ON DELETE CASCADE, '
+            'document tsvector NOT NULL)'
+        )
+        self.execute(
+            f'CREATE INDEX IF NOT EXISTS {self.table}_document_idx '
+            f'ON {self.table} USING gin (document)'
+        )
+
+    def rebuild(self):
+        self.execute(f'TRUNCATE {self.table}')
+        self.execute(
+            f'INSERT INTO {self.table} (title_id, document) '
+            f'SELECT id, {self.document} FROM reviews_title',
+            (self.config, self.config),
+        )
+
+    def index(self, title):
+        self.execute(
+            f'INSERT INTO {self.table} (title_id, document) '
+            f'SELECT id, {self.document} FROM reviews_title WHERE id = %s '
+            'ON CONFLICT (title_id) '
+            'DO UPDATE SET document = EXCLUDED.document',
+            (self.config, self.config, title.pk),
+        )
+
+    def index_many(self, title_ids):
+        self.execute(
+            f'INSERT INTO {self.table} (title_id, document) '
+            f'SELECT id, {self.document} FROM reviews_title '
+            'WHERE id = ANY(%s) '
+            'ON CONFLICT (title_id) '
+            'DO UPDATE SET document = EXCLUDED.document',
+            (self.config, self.config, list(title_ids)),
+        )
+
+    def remove(self, title_id):
+        self.execute(
+            f'DELETE FROM {self.table} WHERE title_id = %s', (title_id,)
+        )
+
+    def search(self, queryset, query):
+        words = WORD_RE.findall(query)
+        if not words:
+            return queryset.none()
+        tsquery = ' & '.join(f'{word}:*' for word in words)
+        rank = RawSQL(
+            f'SELECT ts_rank(document, to_tsquery(%s::regconfig, %s)) '
+            f'FROM {self.table} WHERE title_id = reviews_title.id',
+            (self.config, tsquery), output_field=FloatField(),
+        )
+        return queryset.extra(
+            where=[
+                f'reviews_title.id IN (SELECT title_id FROM {self.table} '
+                'WHERE document @@ to_tsquery(%s::regconfig, %s))'
+            ],
+            params=(self.config, tsquery),
+        ).annotate(search_rank=rank).order_by('-search_rank', 'pk')
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SqliteFTSSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(connection=None):
+    connection = connection or default_connection
+    backend_path = getattr(settings, 'TITLE_SEARCH_BACKEND', None)
+    if backend_path:
+        backend_class = import_string(backend_path)
+    else:
+        backend_class = VENDOR_BACKENDS.get(
+            connection.vendor, IcontainsSearchBackend
+        )
+    return backend_class(connection)
@@ -0,0 +1,225 @@
+from django.db import transaction
+from django.db.models import (Case, Count, ExpressionWrapper, F, FloatField,
+                              OuterRef, Q, Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from reviews import leaderboards
+from reviews.models import Comment, Review, ScoreHistogram, Title
+
+RATING_EXPRESSION = Case(
+    When(review_count=0, then=Value(None)),
+    default=ExpressionWrapper(
+        Cast('score_sum', FloatField()) / F('review_count'),
+        output_field=FloatField(),
+    ),
+    output_field=FloatField(),
+)
+
+
+def change_title_score(title_id, score_delta, count_delta):
+    """Инкрементальное обновление рейтинга тайтла.
+
+    Вызывается внутри транзакции, в которой меняется отзыв.
+    """
+    titles = Title.objects.filter(pk=title_id)
+    titles.update(
+        score_sum=F('score_sum') + score_delta,
+        review_count=F('review_count') + count_delta,
+        version=F('version') + 1,
+        modified=timezone.now(),
+    )
+    titles.update(rating=RATING_EXPRESSION)
+
+
+def change_review_score(title_id, old_score=None, new_score=None):
+    """Рейтинг, распределение оценок и доски лидеров после записи отзыва.
+
+    old_score — None для нового отзыва, new_score — для удалённого.
+    Вызывается в транзакции после того, как отзыв сохранён или удалён.
+    """
+    change_title_score(
+        title_id,
+        (new_score or 0) - (old_score or 0),
+        (new_score is not None) - (old_score is not None),
+    )
+    if old_score == new_score:
+        return
+    leaderboards.title_changed(title_id)
+    changes = {}
+    if old_score is not None:
+        field = ScoreHistogram.field(old_score)
+        changes[field] = F(field) - 1
+    if new_score is not None:
+        field = ScoreHistogram.field(new_score)
+        changes[field] = F(field) + 1
+    if not ScoreHistogram.objects.filter(title_id=title_id).update(**changes):
+        # Строки ещё нет: отзывы появились до таблицы распределений.
+        recalculate_score_histograms(Title.objects.filter(pk=title_id))
+
+
+def change_comment_count(review_id, delta):
+    """Счётчик комментариев отзыва; сбрасывает ETag тайтла.
+
+    Вызывается внутри транзакции, в которой меняется комментарий.
+    Тайтл берётся из самого отзыва, а не из адреса запроса.
+    """
+    Review.objects.filter(pk=review_id).update(
+        comment_count=F('comment_count') + delta
+    )
+    touch_review_title(review_id)
+
+
+def touch_titles(titles):
+    """Увеличивает версию тайтлов, чтобы сбросить их ETag."""
+    return titles.update(version=F('version') + 1, modified=timezone.now())
+
+
+def touch_title(title_id):
+    return touch_titles(Title.objects.filter(pk=title_id))
+
+
+def touch_review_title(review_id):
+    return touch_titles(Title.objects.filter(
+        pk__in=Review.objects.filter(pk=review_id).values('title_id')
+    ))
+
+
+def recalculate_ratings(titles=None):
+    """Полный пересчёт рейтинга тайтлов по таблице отзывов."""
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    titles.update(
+        version=F('version') + 1,
+        modified=timezone.now(),
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        ),
+    )
+    return titles.update(rating=RATING_EXPRESSION)
+
+
+def recalculate_score_histograms(titles=None):
+    """Полный пересчёт распределения оценок по таблице отзывов."""
+    histograms = ScoreHistogram.objects.all()
+    reviews = Review.objects.order_by()
+    if titles is not None:
+        histograms = histograms.filter(title__in=titles)
+        reviews = reviews.filter(title__in=titles)
+    histograms.delete()
+    stats = reviews.values('title').annotate(**{
+        ScoreHistogram.field(score): Count('id', filter=Q(score=score))
+        for score in ScoreHistogram.SCORES
+    })
+    return len(ScoreHistogram.objects.bulk_create(
+        ScoreHistogram(title_id=row.pop('title'), **row)
+        for row in stats.iterator()
+    ))
+
+
+def recalculate_comment_counts(reviews=None):
+    """Полный пересчёт счётчика комментариев по таблице комментариев."""
+    if reviews is None:
+        reviews = Review.objects.all()
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    return reviews.update(comment_count=Coalesce(
+        Subquery(comments.annotate(total=Count('id')).values('total')), 0
+    ))
+
+
+def reconcile_counters():
+    """Чинит разошедшиеся счётчики отзывов тайтлов и комментариев отзывов.
+
+    Пересчитываются только строки, где сохранённое значение не совпадает
+    с фактическим. Возвращает число исправленных тайтлов и отзывов.
+    """
+    reviews = Review.objects.filter(title=OuterRef('pk')).order_by().values(
+        'title'
+    )
+    titles = list(Title.objects.annotate(
+        actual_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')), 0
+        ),
+        actual_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+    ).exclude(
+        review_count=F('actual_count'), score_sum=F('actual_sum')
+    ).values_list('pk', flat=True))
+    recalculate_ratings(Title.objects.filter(pk__in=titles))
+
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    drifted = list(Review.objects.annotate(actual_count=Coalesce(
+        Subquery(comments.annotate(total=Count('id')).values('total')), 0
+    )).exclude(comment_count=F('actual_count')).values_list('pk', flat=True))
+    recalculate_comment_counts(Review.objects.filter(pk__in=drifted))
+    touch_titles(Title.objects.filter(
+        pk__in=Review.objects.filter(pk__in=drifted).values('title_id')
+    ))
+    return len(titles), len(drifted)
+
+
+def delete_user(user):
+    """Удаляет пользователя и пересчитывает счётчики его отзывов.
+
+    Отзывы и комментарии удаляются каскадом, мимо change_review_score,
+    поэтому рейтинг, распределение оценок и доски затронутых тайтлов
+    пересчитываются по таблице отзывов.
+    """
+    with transaction.atomic():
+        title_ids = set(Review.objects.filter(author=user).values_list(
+            'title_id', flat=True
+        ))
+        review_ids = set(Comment.objects.filter(author=user).exclude(
+            review__author=user
+        ).values_list('review_id', flat=True))
+        user.delete()
+        titles = Title.objects.filter(pk__in=title_ids)
+        recalculate_ratings(titles)
+        recalculate_score_histograms(titles)
+        for title_id in title_ids:
+            leaderboards.title_changed(title_id)
+        recalculate_comment_counts(Review.objects.filter(pk__in=review_ids))
+        touch_titles(Title.objects.filter(pk__in=Review.objects.filter(
+            pk__in=review_ids
+        ).values('title_id')))
+
+
+def score_at(counts, position):
+    """Оценка отзыва с номером position (с нуля) в порядке возрастания."""
+    for score, count in counts.items():
+        if position < count:
+            return score
+        position -= count
+    raise IndexError(position)
+
+
+def rating_summary(counts):
+    """Число отзывов, средняя и медиана по распределению оценок.
+
+    counts — {оценка: число отзывов} по возрастанию оценки.
+    """
+    total = sum(counts.values())
+    if not total:
+        return {'count': 0, 'mean': None, 'median': None}
+    return {
+        'count': total,
+        'mean': sum(
+            score * count for score, count in counts.items()
+        ) / total,
+        'median': (
+            score_at(counts, (total - 1) // 2) + score_at(counts, total // 2)
+        ) / 2,
+    }
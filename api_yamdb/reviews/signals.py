@@ -0,0 +1,69 @@
+from django.db import connections
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Title, User
+from reviews.search import get_search_backend
+from reviews.services import touch_title, touch_titles
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, using, **kwargs):
+    """Обновляет тайтл в поисковом индексе."""
+    get_search_backend(connections[using]).index(instance)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, using, **kwargs):
+    """Удаляет тайтл из поискового индекса."""
+    get_search_backend(connections[using]).remove(instance.pk)
+
+
+@receiver(post_save, sender=Title)
+def touch_changed_title(sender, instance, created, **kwargs):
+    """Сбрасывает ETag тайтла при его изменении."""
+    if not created:
+        touch_title(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch_title(instance.pk)
+    elif action == 'pre_clear':
+        touch_titles(instance.titles.all())
+    else:
+        touch_titles(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def touch_related_titles(sender, instance, **kwargs):
+    """Удаление жанра или категории меняет вложенные данные тайтлов."""
+    touch_titles(instance.titles.all())
+
+
+@receiver(pre_save, sender=User)
+def revoke_stale_tokens(sender, instance, update_fields, **kwargs):
+    """Отзывает токены, если изменились права пользователя.
+
+    Смена username токены не отзывает: по нему права не проверяются.
+    """
+    if instance.pk is None:
+        return
+    old = User.objects.filter(pk=instance.pk).values(
+        'token_version', *User.TOKEN_REVOKING_FIELDS
+    ).first()
+    if old is None or all(
+        old[field] == getattr(instance, field)
+        for field in User.TOKEN_REVOKING_FIELDS
+    ):
+        return
+    instance.token_version = old['token_version'] + 1
+    if update_fields is not None and 'token_version' not in update_fields:
+        User.objects.filter(pk=instance.pk).update(
+            token_version=instance.token_version
+        )
@@ -0,0 +1,311 @@
+"""Нагрузочный прогон всех маршрутов api/urls.py через тестовый клиент.
+
+Для каждого сценария печатает p50/p95/p99, число SQL-запросов на запрос
+и пропускную способность. Примеры:
+
+    python benchmarks/bench_api.py --titles 5000 --reviews 100000
+    python benchmarks/bench_api.py --json before.json
+    python benchmarks/bench_api.py --compare main HEAD
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import (PROJECT_DIR, ROOT_DIR, percentile, seed_dataset,
+                    setup_django)
+
+
+class Context:
+    """Данные, общие для сценариев: клиенты, id и счётчик уникальности."""
+
+    def __init__(self):
+        from django.contrib.auth.tokens import default_token_generator
+        from rest_framework.test import APIClient
+        try:
+            from api.authentication import UserAccessToken as AccessToken
+        except ImportError:
+            from rest_framework_simplejwt.tokens import AccessToken
+
+        from reviews.models import Category, Genre, Review, User
+
+        self.token_generator = default_token_generator
+        self.admin = User.objects.create_user(
+            username='bench_admin', email='bench_admin@yamdb.fake',
+            role=User.ADMIN,
+        )
+        self.anonymous = APIClient()
+        self.admin_client = APIClient()
+        self.admin_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.admin)}'
+        )
+        self.hot_title_id = Review.objects.values_list(
+            'title_id', flat=True
+        ).order_by('id').first()
+        self.review = Review.objects.filter(
+            title_id=self.hot_title_id
+        ).order_by('id').first()
+        self.user = self.review.author
+        self.user_client = APIClient()
+        self.user_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}'
+        )
+        self.genre_slug = Genre.objects.values_list('slug', flat=True)[0]
+        self.category_slug = Category.objects.values_list(
+            'slug', flat=True
+        )[0]
+        self.counter = 0
+
+    def unique(self):
+        self.counter += 1
+        return self.counter
+
+
+def post_review(ctx):
+    from reviews.models import Title
+
+    # Каждый раз новый тайтл: отзыв от одного автора возможен лишь один.
+    title = Title.objects.create(name=f'Bench {ctx.unique()}', year=2000)
+    return ctx.admin_client.post(
+        f'/api/v1/titles/{title.id}/reviews/',
+        {'text': 'Отзыв', 'score': 7},
+    )
+
+
+def signup(ctx):
+    number = ctx.unique()
+    return ctx.anonymous.post('/api/v1/auth/signup/', {
+        'username': f'bench{number}', 'email': f'bench{number}@yamdb.fake',
+    })
+
+
+def obtain_token(ctx):
+    return ctx.anonymous.post('/api/v1/auth/token/', {
+        'username': ctx.user.username,
+        'confirmation_code': ctx.token_generator.make_token(ctx.user),
+    })
+
+
+def create_and_delete_genre(ctx):
+    slug = f'bench-genre-{ctx.unique()}'
+    ctx.admin_client.post(
+        '/api/v1/genres/', {'name': slug, 'slug': slug}
+    )
+    return ctx.admin_client.delete(f'/api/v1/genres/{slug}/')
+
+
+def create_title(ctx):
+    return ctx.admin_client.post('/api/v1/titles/', {
+        'name': f'Bench {ctx.unique()}', 'year': 2000,
+        'genre': [ctx.genre_slug], 'category': ctx.category_slug,
+    })
+
+
+def get_scenarios(ctx):
+    """Сценарии: имя -> функция, выполняющая один запрос."""
+    title_url = f'/api/v1/titles/{ctx.hot_title_id}/'
+    reviews_url = f'{title_url}reviews/'
+    review_url = f'{reviews_url}{ctx.review.id}/'
+    comments_url = f'{review_url}comments/'
+    return {
+        'GET titles': lambda: ctx.anonymous.get('/api/v1/titles/'),
+        'GET titles?limit=100': lambda: ctx.anonymous.get(
+            '/api/v1/titles/?limit=100'
+        ),
+        'GET titles (auth)': lambda: ctx.user_client.get('/api/v1/titles/'),
+        'GET titles?genre=': lambda: ctx.anonymous.get(
+            f'/api/v1/titles/?genre={ctx.genre_slug}'
+        ),
+        'GET titles/{id}': lambda: ctx.anonymous.get(title_url),
+        'GET categories': lambda: ctx.anonymous.get('/api/v1/categories/'),
+        'GET genres': lambda: ctx.anonymous.get('/api/v1/genres/'),
+        'GET reviews': lambda: ctx.anonymous.get(reviews_url),
+        'GET reviews?offset=deep': lambda: ctx.anonymous.get(
+            f'{reviews_url}?offset=500'
+        ),
+        'GET reviews/{id}': lambda: ctx.anonymous.get(review_url),
+        'GET comments': lambda: ctx.anonymous.get(comments_url),
+        'GET users': lambda: ctx.admin_client.get('/api/v1/users/'),
+        'GET users/me': lambda: ctx.user_client.get('/api/v1/users/me/'),
+        'GET users/{username}': lambda: ctx.admin_client.get(
+            f'/api/v1/users/{ctx.user.username}/'
+        ),
+        'POST reviews': lambda: post_review(ctx),
+        'PATCH reviews/{id}': lambda: ctx.user_client.patch(
+            review_url, {'text': 'Изменённый отзыв'}
+        ),
+        'POST comments': lambda: ctx.user_client.post(
+            comments_url, {'text': 'Комментарий'}
+        ),
+        'POST titles': lambda: create_title(ctx),
+        'POST+DELETE genres': lambda: create_and_delete_genre(ctx),
+        'POST auth/signup': lambda: signup(ctx),
+        'POST auth/token': lambda: obtain_token(ctx),
+    }
+
+
+class QueryCounter:
+    """execute_wrapper, считающий SQL-запросы.
+
+    CaptureQueriesContext здесь не годится: request_started
+    сбрасывает connection.queries_log посреди запроса.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_scenario(request, repeat, warmup):
+    from django.db import connection
+
+    queries = QueryCounter()
+    with connection.execute_wrapper(queries):
+        response = request()
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f'статус {response.status_code}: {response.content[:200]}'
+        )
+    for _ in range(warmup):
+        request()
+    timings = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        request_started = time.perf_counter()
+        request()
+        timings.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        'p50': statistics.median(timings),
+        'p95': percentile(timings, 95),
+        'p99': percentile(timings, 99),
+        'queries': queries.count,
+        'rps': repeat / elapsed if elapsed else 0,
+    }
+
+
+def print_table(results):
+    print(f'{"сценарий":<26}{"p50 мс":>9}{"p95 мс":>9}{"p99 мс":>9}'
+          f'{"SQL":>6}{"зап/с":>9}')
+    for name, row in results.items():
+        if 'error' in row:
+            print(f'{name:<26}  ошибка: {row["error"]}')
+            continue
+        print(f'{name:<26}{row["p50"]:>9.2f}{row["p95"]:>9.2f}'
+              f'{row["p99"]:>9.2f}{row["queries"]:>6}{row["rps"]:>9.0f}')
+
+
+def run(args):
+    setup_django(project_dir=args.project_dir)
+    seed_dataset(users=args.users, titles=args.titles, genres=args.genres,
+                 reviews=args.reviews, comments=args.comments,
+                 skew=args.skew)
+    ctx = Context()
+    results = {}
+    for name, request in get_scenarios(ctx).items():
+        if args.only and args.only not in name:
+            continue
+        try:
+            results[name] = run_scenario(request, args.repeat, args.warmup)
+        except Exception as error:
+            results[name] = {'error': str(error)}
+    return results
+
+
+def compare(base, head, threshold):
+    """Печатает разницу p95 и возвращает список регрессий."""
+    regressions = []
+    print(f'{"сценарий":<26}{"p95 было":>10}{"p95 стало":>11}{"Δ":>8}'
+          f'{"SQL":>10}')
+    for name, after in head.items():
+        before = base.get(name)
+        if not before or 'error' in before or 'error' in after:
+            continue
+        change = (after['p95'] - before['p95']) / before['p95'] * 100
+        queries = f'{before["queries"]}→{after["queries"]}'
+        mark = ''
+        if change > threshold or after['queries'] > before['queries']:
+            regressions.append(name)
+            mark = '  ← регрессия'
+        print(f'{name:<26}{before["p95"]:>10.2f}{after["p95"]:>11.2f}'
+              f'{change:>+7.0f}%{queries:>10}{mark}')
+    return regressions
+
+
+def run_revision(revision, args, workdir):
+    """Запускает этот же скрипт против ревизии в отдельном worktree."""
+    tree = os.path.join(workdir, revision.replace('/', '_'))
+    subprocess.run(
+        ('git', 'worktree', 'add', '--detach', tree, revision),
+        cwd=ROOT_DIR, check=True, capture_output=True,
+    )
+    output = os.path.join(workdir, f'{os.path.basename(tree)}.json')
+    try:
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            '--project-dir', os.path.join(tree, 'api_yamdb'),
+            '--json', output,
+        ]
+        for option in ('users', 'titles', 'genres', 'reviews', 'comments',
+                       'skew', 'repeat', 'warmup', 'only'):
+            value = getattr(args, option)
+            if value is not None:
+                command += [f'--{option}', str(value)]
+        subprocess.run(command, check=True)
+    finally:
+        subprocess.run(
+            ('git', 'worktree', 'remove', '--force', tree),
+            cwd=ROOT_DIR, check=False,
+        )
+    with open(output) as result:
+        return json.load(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--reviews', type=int, default=50000)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--skew', type=float, default=1.1,
+                        help='Показатель закона Ципфа для отзывов.')
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', help='Подстрока имени сценария.')
+    parser.add_argument('--project-dir', default=PROJECT_DIR)
+    parser.add_argument('--json', help='Сохранить результаты в файл.')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'),
+                        help='Сравнить две git-ревизии.')
+    parser.add_argument('--threshold', type=float, default=10,
+                        help='Допустимый рост p95 в процентах.')
+    args = parser.parse_args()
+
+    if args.compare:
+        with tempfile.TemporaryDirectory() as workdir:
+            base, head = (
+                run_revision(revision, args, workdir)
+                for revision in args.compare
+            )
+            regressions = compare(base, head, args.threshold)
+        if regressions:
+            print(f'Регрессии: {", ".join(regressions)}')
+            sys.exit(1)
+        return
+
+    results = run(args)
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(results, output, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Сравнение планов и времени запросов без индексов и с ними.
+
+Пример запуска:
+
+    python benchmarks/bench_indexes.py --titles 20000 --reviews 500000
+"""
+import argparse
+
+from common import measure, seed_dataset, setup_django, summary
+
+COMPOSITE_INDEXES = (
+    ('Review', 'review_title_pub_date_idx'),
+    ('Comment', 'comment_review_pub_date_idx'),
+    ('Title', 'title_category_year_idx'),
+    ('Title', 'title_rating_idx'),
+    ('Title', 'title_category_rating_idx'),
+)
+
+
+def get_queries():
+    from reviews.models import Comment, Review, Title
+
+    title_id = Title.objects.order_by('-review_count').values_list(
+        'id', flat=True
+    ).first()
+    review_id = Review.objects.filter(title_id=title_id).order_by(
+        'id'
+    ).values_list('id', flat=True).first()
+    category_id, year = Title.objects.values_list(
+        'category_id', 'year'
+    ).first()
+    return {
+        'reviews of hottest title': lambda: Review.objects.filter(
+            title_id=title_id
+        ).order_by('-pub_date')[1000:1004],
+        'comments of a review': lambda: Comment.objects.filter(
+            review_id=review_id
+        ).order_by('-pub_date')[:4],
+        'titles by category and year': lambda: Title.objects.filter(
+            category_id=category_id, year=year
+        )[:4],
+        'top rated titles': lambda: Title.objects.order_by(
+            '-rating', '-pk'
+        )[:10],
+        'top rated in category': lambda: Title.objects.filter(
+            category_id=category_id
+        ).order_by('-rating', '-pk')[:10],
+    }
+
+
+def run(label, queries, repeat):
+    print(f'=== {label} ===')
+    for name, build in queries.items():
+        print(f'-- {name}')
+        print(build().explain())
+        print(summary(measure(lambda: list(build()), repeat)))
+
+
+def toggle_indexes(add):
+    from django.apps import apps
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for model_name, index_name in COMPOSITE_INDEXES:
+            model = apps.get_model('reviews', model_name)
+            index = next(
+                index for index in model._meta.indexes
+                if index.name == index_name
+            )
+            if add:
+                editor.add_index(model, index)
+            else:
+                editor.remove_index(model, index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--reviews', type=int, default=200000)
+    parser.add_argument('--comments', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    seed_dataset(users=args.users, titles=args.titles,
+                 reviews=args.reviews, comments=args.comments)
+    queries = get_queries()
+    toggle_indexes(add=False)
+    run('без индексов', queries, args.repeat)
+    toggle_indexes(add=True)
+    run('с индексами', queries, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Рендеринг ответа со списком тайтлов: JSONRenderer против orjson.
+
+Данные берутся из настоящего ответа `/api/v1/titles/?limit=N`
+(по умолчанию 1000 элементов), рендеринг измеряется отдельно от
+запроса. Пример:
+
+    python benchmarks/bench_renderers.py --items 1000
+"""
+import argparse
+
+from common import measure, seed_dataset, setup_django, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    seed_dataset(titles=args.items, reviews=args.items * 5, comments=0)
+    from django.conf import settings
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from api.renderers import FastJSONRenderer, orjson
+
+    response = APIClient().get(f'/api/v1/titles/?limit={args.items}')
+    data = response.data
+    print(f'элементов: {len(data["results"])}, '
+          f'orjson: {"есть" if orjson else "не установлен"}')
+    expected = JSONRenderer().render(data)
+    for backend in ('json', 'orjson'):
+        settings.API_JSON_BACKEND = backend
+        rendered = FastJSONRenderer().render(data)
+        assert rendered == expected, f'{backend}: вывод отличается'
+    renderers = (
+        ('JSONRenderer', JSONRenderer(), 'json'),
+        ('FastJSONRenderer', FastJSONRenderer(), 'orjson'),
+    )
+    for name, renderer, backend in renderers:
+        settings.API_JSON_BACKEND = backend
+        timings = measure(lambda: renderer.render(data), args.repeat)
+        print(f'{name:<18}{summary(timings)}  {len(expected)} байт')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Стоимость сериализации строки: ModelSerializer против values().
+
+Для тайтлов, отзывов и комментариев сравниваются два этапа: только
+сериализация уже загруженной страницы и загрузка вместе с ней.
+Пример:
+
+    python benchmarks/bench_serializers.py --rows 1000
+"""
+import argparse
+import statistics
+
+from common import measure, seed_dataset, setup_django
+
+
+def get_cases(rows):
+    from api.serializers import (CommentSerializer, ReadOnlyTitleSerializer,
+                                 ReviewSerializer)
+    from api.values import CommentValues, ReviewValues, TitleValues
+    from reviews.models import Comment, Review, Title
+
+    # Для отзывов и комментариев берётся самый популярный родитель,
+    # как в list вложенного маршрута.
+    title_id = Review.objects.values_list(
+        'title_id', flat=True
+    ).order_by('id').first()
+    review_id = Comment.objects.values_list(
+        'review_id', flat=True
+    ).order_by('id').first()
+    return {
+        'titles': (
+            Title.objects.select_related('category').prefetch_related('genre'),
+            ReadOnlyTitleSerializer, TitleValues,
+        ),
+        'reviews': (
+            Review.objects.filter(title_id=title_id),
+            ReviewSerializer, ReviewValues,
+        ),
+        'comments': (
+            Comment.objects.filter(review_id=review_id),
+            CommentSerializer, CommentValues,
+        ),
+    }
+
+
+def run_case(queryset, serializer_class, values_class, rows, repeat):
+    def load_instances():
+        return list(queryset[:rows])
+
+    def load_values():
+        return list(
+            queryset.prefetch_related(None).values(*values_class.fields)[:rows]
+        )
+
+    instances = load_instances()
+    values = load_values()
+    count = len(instances)
+    timings = {
+        'serializer': measure(
+            lambda: serializer_class(instances, many=True).data, repeat
+        ),
+        'values': measure(lambda: values_class.represent(values), repeat),
+        'serializer+SQL': measure(
+            lambda: serializer_class(load_instances(), many=True).data,
+            repeat,
+        ),
+        'values+SQL': measure(
+            lambda: values_class.represent(load_values()), repeat
+        ),
+    }
+    return count, {
+        name: statistics.median(values) * 1000 / max(count, 1)
+        for name, values in timings.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=50000)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--rows', type=int, default=500,
+                        help='Строк на страницу.')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    seed_dataset(titles=args.titles, reviews=args.reviews,
+                 comments=args.comments)
+    print(f'{"список":<10}{"строк":>7}{"этап":>16}{"мкс/строка":>12}'
+          f'{"ускорение":>11}')
+    for name, case in get_cases(args.rows).items():
+        count, costs = run_case(*case, args.rows, args.repeat)
+        for before, after in (('serializer', 'values'),
+                              ('serializer+SQL', 'values+SQL')):
+            print(f'{name:<10}{count:>7}{before:>16}{costs[before]:>12.1f}')
+            print(f'{name:<10}{count:>7}{after:>16}{costs[after]:>12.1f}'
+                  f'{costs[before] / costs[after]:>10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Пропускная способность записи: POST отзывов в несколько потоков.
+
+Каждый профиль БД запускается в отдельном процессе, потому что
+настройки читаются из окружения при старте Django. С --contended все
+потоки пишут отзывы в одни и те же тайтлы: на каждый тайтл проходит
+один POST, остальные получают 400 от ограничения unique_review.
+Примеры:
+
+    python benchmarks/bench_writes.py --threads 1 4 8
+    python benchmarks/bench_writes.py --profiles sqlite-wal --contended
+    DB_HOST=localhost DB_PASSWORD=... python benchmarks/bench_writes.py \\
+        --profiles sqlite-wal postgresql
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from common import percentile, seed_dataset, setup_django
+
+PROFILES = {
+    # Прежнее поведение: новое соединение на запрос, rollback-журнал.
+    'sqlite-default': {
+        'DB_ENGINE': 'sqlite',
+        'DB_CONN_MAX_AGE': '0',
+        'SQLITE_JOURNAL_MODE': 'delete',
+        'SQLITE_SYNCHRONOUS': 'full',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_CACHE_SIZE': '-2000',
+    },
+    'sqlite-wal': {'DB_ENGINE': 'sqlite'},
+    'postgresql': {'DB_ENGINE': 'postgresql'},
+}
+
+
+def make_client(user):
+    from rest_framework.test import APIClient
+    try:
+        from api.authentication import UserAccessToken as AccessToken
+    except ImportError:
+        from rest_framework_simplejwt.tokens import AccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+    )
+    return client
+
+
+def worker(user, title_ids, barrier, timings, statuses):
+    from django.db import connections
+
+    client = make_client(user)
+    barrier.wait()
+    try:
+        for title_id in title_ids:
+            started = time.perf_counter()
+            try:
+                status = client.post(
+                    f'/api/v1/titles/{title_id}/reviews/',
+                    {'text': 'Отзыв', 'score': 7},
+                ).status_code
+            except Exception:
+                # Тестовый клиент пробрасывает исключения вьюхи.
+                status = 500
+            timings.append((time.perf_counter() - started) * 1000)
+            statuses.append(status)
+    finally:
+        connections.close_all()
+
+
+def run_threads(threads, title_ids, contended=False):
+    """Каждый поток пишет от своего автора в свою часть тайтлов.
+
+    При contended потоки пишут во все тайтлы от одного автора.
+    """
+    from reviews.models import Review, User
+
+    Review.objects.all().delete()
+    users = list(User.objects.order_by('id')[:threads])
+    if contended:
+        users = users[:1] * threads
+    barrier = threading.Barrier(threads + 1)
+    timings, statuses = [], []
+    pool = [
+        threading.Thread(target=worker, args=(
+            user, title_ids if contended else title_ids[number::threads],
+            barrier, timings, statuses,
+        ))
+        for number, user in enumerate(users)
+    ]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': len(timings),
+        'duplicates': statuses.count(400),
+        'errors': len(statuses) - statuses.count(201) - statuses.count(400),
+        'rps': len(timings) / elapsed if elapsed else 0,
+        'p50': statistics.median(timings),
+        'p95': percentile(timings, 95),
+    }
+
+
+def run_profile(args):
+    """Замер одного профиля в текущем процессе; печатает JSON."""
+    setup_django()
+    seed_dataset(users=max(args.threads), titles=args.titles, genres=3,
+                 categories=1, reviews=0, comments=0)
+    from reviews.models import Title
+
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    results = {
+        threads: run_threads(threads, title_ids, args.contended)
+        for threads in args.threads
+    }
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES,
+                        default=['sqlite-default', 'sqlite-wal'])
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, 4, 8])
+    parser.add_argument('--titles', type=int, default=400,
+                        help='Сколько отзывов пишется за прогон.')
+    parser.add_argument('--contended', action='store_true',
+                        help='Все потоки пишут в одни и те же тайтлы.')
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_profile(args)
+        return
+
+    print(f'{"профиль":<16}{"потоки":>7}{"запросов":>9}{"дублей":>8}'
+          f'{"ошибок":>8}{"зап/с":>9}{"p50 мс":>9}{"p95 мс":>9}')
+    for profile in args.profiles:
+        command = [
+            sys.executable, os.path.abspath(__file__), '--child',
+            '--titles', str(args.titles),
+            '--threads', *map(str, args.threads),
+            *(['--contended'] if args.contended else []),
+        ]
+        env = dict(os.environ, **PROFILES[profile])
+        process = subprocess.run(
+            command, env=env, capture_output=True, text=True
+        )
+        if process.returncode:
+            print(f'{profile:<16}  ошибка: {process.stderr.strip()[-200:]}')
+            continue
+        results = json.loads(process.stdout.strip().splitlines()[-1])
+        for threads, row in results.items():
+            print(f'{profile:<16}{threads:>7}{row["requests"]:>9}'
+                  f'{row["duplicates"]:>8}{row["errors"]:>8}'
+                  f'{row["rps"]:>9.0f}'
+                  f'{row["p50"]:>9.2f}{row["p95"]:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
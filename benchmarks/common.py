@@ -0,0 +1,191 @@
+"""Общие утилиты бенчмарков: настройка Django и генерация данных.
+
+Модуль не импортирует код приложения на верхнем уровне и не опирается
+на его служебные функции: так бенчмарки можно запускать и против
+старых ревизий проекта (см. bench_api.py --compare).
+"""
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, 'api_yamdb')
+
+
+# Команды, пересчитывающие производные данные после bulk_create.
+REBUILD_COMMANDS = (
+    'recalculate_ratings', 'reconcile_counters', 'rebuild_score_histograms',
+    'refresh_leaderboards', 'rebuild_search_index',
+)
+
+
+def setup_django(db_path=None, project_dir=PROJECT_DIR):
+    """Поднимает Django на отдельной базе и применяет миграции.
+
+    Для SQLite это временный файл, для серверных БД — тестовая база
+    test_<NAME>, пересоздаваемая при каждом запуске.
+    """
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.DEBUG = False
+    if 'sqlite' not in settings.DATABASES['default']['ENGINE']:
+        # Серверная БД: работаем на отдельной тестовой базе.
+        django.setup()
+        from django.db import connection
+        return connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    settings.DATABASES['default']['NAME'] = db_path
+    django.setup()
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def skewed_counts(total, buckets, skew=1.1):
+    """Распределяет total по buckets по закону Ципфа."""
+    weights = [1 / (rank ** skew) for rank in range(1, buckets + 1)]
+    norm = sum(weights)
+    return [int(total * weight / norm) for weight in weights]
+
+
+def bulk_insert(model, objs, batch_size):
+    """bulk_create порциями, не держа все объекты в памяти."""
+    objs = iter(objs)
+    while True:
+        batch = list(islice(objs, batch_size))
+        if not batch:
+            return
+        model.objects.bulk_create(batch)
+
+
+@contextmanager
+def keep_pub_date(*models):
+    """Отключает auto_now_add, чтобы записать сгенерированные даты."""
+    fields = [model._meta.get_field('pub_date') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def rebuild_denormalized():
+    """Пересчитывает производные данные, если ревизия это умеет."""
+    from django.core.management import call_command, get_commands
+
+    available = get_commands()
+    for command in REBUILD_COMMANDS:
+        if command in available:
+            call_command(command, verbosity=0, stdout=io.StringIO())
+
+
+def seed_dataset(users=1000, titles=10000, genres=20, categories=5,
+                 reviews=100000, comments=100000, skew=1.1,
+                 batch_size=5000, seed=0):
+    """Заполняет базу синтетическими данными с «длинным хвостом».
+
+    Отзывы и комментарии распределены по тайтлам и отзывам по закону
+    Ципфа: немногие популярные тайтлы получают большую часть отзывов.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+    from django.utils import timezone
+
+    from reviews.models import Category, Comment, Genre, Review, Title, User
+
+    rnd = random.Random(seed)
+    now = timezone.now()
+    password = make_password(None)
+    GenreTitle = Title.genre.through
+
+    def random_date():
+        return now - timedelta(minutes=rnd.randint(0, 10 ** 6))
+
+    with transaction.atomic(), keep_pub_date(Review, Comment):
+        bulk_insert(User, (
+            User(username=f'user{number}', email=f'user{number}@yamdb.fake',
+                 password=password)
+            for number in range(users)
+        ), batch_size)
+        user_ids = list(User.objects.values_list('id', flat=True))
+        bulk_insert(Category, (
+            Category(name=f'Категория {number}', slug=f'category-{number}')
+            for number in range(categories)
+        ), batch_size)
+        category_ids = list(Category.objects.values_list('id', flat=True))
+        bulk_insert(Genre, (
+            Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(genres)
+        ), batch_size)
+        genre_ids = list(Genre.objects.values_list('id', flat=True))
+        bulk_insert(Title, (
+            Title(name=f'Тайтл {number}', year=rnd.randint(1900, 2022),
+                  description=f'Описание тайтла {number}',
+                  category_id=rnd.choice(category_ids))
+            for number in range(titles)
+        ), batch_size)
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        bulk_insert(GenreTitle, (
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in rnd.sample(genre_ids, rnd.randint(1, 3))
+        ), batch_size)
+
+        per_title = skewed_counts(reviews, len(title_ids), skew)
+        bulk_insert(Review, (
+            Review(title_id=title_id, author_id=author_id, text='Отзыв',
+                   score=rnd.randint(1, 10), pub_date=random_date())
+            for title_id, count in zip(title_ids, per_title)
+            for author_id in rnd.sample(user_ids, min(count, len(user_ids)))
+        ), batch_size)
+        review_ids = list(
+            Review.objects.order_by('id').values_list('id', flat=True)
+        )
+        per_review = skewed_counts(comments, len(review_ids), skew)
+        bulk_insert(Comment, (
+            Comment(review_id=review_id, author_id=rnd.choice(user_ids),
+                    text='Комментарий', pub_date=random_date())
+            for review_id, count in zip(review_ids, per_review)
+            for _ in range(count)
+        ), batch_size)
+        rebuild_denormalized()
+
+
+def measure(func, repeat=20):
+    """Возвращает список времён выполнения func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = int(round(percent / 100 * (len(ordered) - 1)))
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summary(timings):
+    return (
+        f'p50={statistics.median(timings):.2f} мс '
+        f'p95={percentile(timings, 95):.2f} мс '
+        f'max={max(timings):.2f} мс'
+    )
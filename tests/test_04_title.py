@@ -249,3 +249,69 @@ class Test04TitleAPI:
         user, moderator = create_users_api(admin_client)
         self.check_permissions(user, 'обычного пользователя', titles, categories, genres)
         self.check_permissions(moderator, 'модератора', titles, categories, genres)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_titles_query_count(self, client, admin_client, django_assert_max_num_queries):
+        from reviews.models import Title
+
+        titles, categories, genres = create_titles(admin_client)
+        genre_ids = list(Title.objects.get(pk=titles[0]['id']).genre.values_list('id', flat=True))
+        category_id = Title.objects.get(pk=titles[0]['id']).category_id
+        for number in range(50):
+            title = Title.objects.create(name=f'Тайтл {number}', year=2000, category_id=category_id)
+            title.genre.set(genre_ids)
+
+        # count, выборка тайтлов с категорией, выборка жанров
+        with django_assert_max_num_queries(3):
+            response = client.get('/api/v1/titles/?limit=100')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 52, (
+            'Проверьте, что GET запрос `/api/v1/titles/?limit=100` возвращает все тайтлы'
+        )
+        # версия тайтла для ETag, тайтл с категорией, жанры
+        with django_assert_max_num_queries(3):
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_titles_filter_by_slugs(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        cases = (
+            (f'genre={genres[0]["slug"]},{genres[2]["slug"]}', 2, 'нескольким жанрам через запятую'),
+            (f'genre={genres[0]["slug"][:-1]}', 0, 'жанру: слаг должен совпадать полностью'),
+            (f'genre={genres[2]["slug"][:3]}*', 1, 'префиксу слага жанра'),
+            (f'category={categories[0]["slug"][:-1]}', 0, 'категории: слаг должен совпадать полностью'),
+            (f'category={categories[0]["slug"][:3]}*', 1, 'префиксу слага категории'),
+            (f'category={categories[0]["slug"]},{categories[1]["slug"]}', 2, 'нескольким категориям'),
+        )
+        for query, count, description in cases:
+            response = client.get(f'/api/v1/titles/?{query}')
+            assert response.json()['count'] == count, (
+                f'Проверьте фильтрацию `/api/v1/titles/` по {description} (`?{query}`)'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_titles_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = {'name': 'Просто фильм', 'year': 2001, 'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'], 'description': 'Не проект'}
+        admin_client.post('/api/v1/titles/', data=data)
+        response = client.get('/api/v1/titles/?search=проект')
+        results = response.json()['results']
+        assert [title['name'] for title in results] == ['Проект', 'Просто фильм'], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по названию и описанию '
+            'и ставит совпадения в названии выше'
+        )
+        response = client.get('/api/v1/titles/?search=драм')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по началу слова'
+        )
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Другое'})
+        response = client.get('/api/v1/titles/?search=проект')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении тайтла'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        response = client.get('/api/v1/titles/?search=поворот')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при удалении тайтла'
+        )
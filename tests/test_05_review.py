@@ -1,7 +1,7 @@
 import pytest
 
-from .common import (auth_client, create_reviews, create_titles,
-                     create_users_api)
+from .common import (auth_client, create_comments, create_reviews,
+                     create_titles, create_users_api)
 
 
 class Test05ReviewAPI:
@@ -334,3 +334,63 @@ class Test05ReviewAPI:
             'без токена авторизации возвращается статус 401'
         )
         self.check_permissions(user, 'обычного пользователя', reviews, titles)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_reviews_cursor_pagination(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        assert 'count' in response.json(), (
+            'Проверьте, что по умолчанию `/api/v1/titles/{title_id}/reviews/` '
+            'использует пагинацию limit/offset'
+        )
+        response = client.get(url, {'pagination': 'cursor', 'limit': 2})
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data and data['previous'] is None, (
+            'Проверьте, что при `pagination=cursor` используется курсорная пагинация'
+        )
+        received = [review['id'] for review in data['results']]
+        assert len(received) == 2 and data['next'], (
+            'Проверьте, что курсорная пагинация учитывает параметр `limit`'
+        )
+        response = client.get(data['next'])
+        data = response.json()
+        received += [review['id'] for review in data['results']]
+        assert data['next'] is None
+        assert received == sorted((review['id'] for review in reviews), reverse=True), (
+            'Проверьте, что курсорная пагинация отдаёт отзывы от новых к старым без повторов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_cursor_pagination_tied_pub_date(self, client, admin_client, admin):
+        from django.db import connection
+
+        from reviews.models import Comment
+
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        for number in range(4):
+            admin_client.post(url, data={'text': f'Ещё {number}'})
+        Comment.objects.update(pub_date=Comment.objects.first().pub_date)
+        expected = sorted(Comment.objects.values_list('id', flat=True), reverse=True)
+
+        pages, sql = [], []
+        next_url = f'{url}?pagination=cursor&limit=2'
+        with connection.execute_wrapper(lambda execute, query, *args: sql.append(query) or execute(query, *args)):
+            while next_url:
+                data = client.get(next_url).json()
+                pages.append(data)
+                next_url = data['next']
+        received = [comment['id'] for page in pages for comment in page['results']]
+        assert received == expected, (
+            'Проверьте, что курсорная пагинация отдаёт записи с одинаковой `pub_date` '
+            'по убыванию id без пропусков и повторов'
+        )
+        assert not any('OFFSET' in query.upper() for query in sql), (
+            'Проверьте, что курсорная пагинация не использует OFFSET при одинаковой `pub_date`'
+        )
+        data = client.get(pages[-1]['previous']).json()
+        assert [comment['id'] for comment in data['results']] == expected[-3:-1], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу'
+        )
@@ -0,0 +1,65 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08RatingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_stored(self, admin_client, admin):
+        from reviews.models import Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.review_count == 3, (
+            'Проверьте, что при создании отзыва увеличивается `review_count` тайтла'
+        )
+        assert title.score_sum == 12, (
+            'Проверьте, что при создании отзыва увеличивается `score_sum` тайтла'
+        )
+        assert title.rating == 4, (
+            'Проверьте, что при создании отзыва пересчитывается `rating` тайтла'
+        )
+
+        client_user = auth_client(user)
+        client_user.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        title.refresh_from_db()
+        assert title.score_sum == 18 and title.review_count == 3, (
+            'Проверьте, что при изменении оценки отзыва пересчитывается рейтинг тайтла'
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        title.refresh_from_db()
+        assert title.review_count == 2 and title.score_sum == 13, (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг тайтла'
+        )
+        assert title.rating == 6.5, (
+            'Проверьте, что при удалении отзыва пересчитывается `rating` тайтла'
+        )
+
+        empty = Title.objects.get(pk=titles[1]['id'])
+        assert empty.rating is None and empty.review_count == 0, (
+            'Проверьте, что у тайтла без отзывов `rating` равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recalculate_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating=None, review_count=0, score_sum=0)
+        call_command('recalculate_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating, title.review_count, title.score_sum) == (4, 3, 12), (
+            'Проверьте, что команда `recalculate_ratings` пересчитывает рейтинг тайтлов'
+        )
+        empty = Title.objects.get(pk=titles[1]['id'])
+        assert empty.rating is None and empty.review_count == 0, (
+            'Проверьте, что команда `recalculate_ratings` обнуляет рейтинг тайтлов без отзывов'
+        )
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+class Test09ImportCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_static_data(self):
+        from reviews.models import Comment, Review, Title, User
+
+        call_command('import_csv', path=DATA_DIR, batch_size=10)
+        assert User.objects.filter(username='bingobongo').exists(), (
+            'Проверьте, что команда `import_csv` загружает пользователей'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.category.slug == 'movie', (
+            'Проверьте, что команда `import_csv` связывает тайтлы с категориями'
+        )
+        assert title.genre.exists(), (
+            'Проверьте, что команда `import_csv` загружает связи тайтлов с жанрами'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `import_csv` сохраняет `pub_date` из файла'
+        )
+        assert title.review_count == title.reviews.count(), (
+            'Проверьте, что после загрузки пересчитывается рейтинг тайтлов'
+        )
+        assert Comment.objects.count() == 3, (
+            'Проверьте, что команда `import_csv` загружает комментарии'
+        )
@@ -0,0 +1,74 @@
+import pytest
+from django.db import transaction
+
+from reviews.models import Category
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test10CacheAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_catalogue_cache(self, client, admin_client, admin):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS'
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET запрос `/api/v1/categories/` отдаётся из кэша'
+        )
+        response = client.get('/api/v1/categories/?limit=1')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кэша учитывает строку запроса'
+        )
+        admin_client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS' and response.json()['count'] == 3, (
+            'Проверьте, что кэш `/api/v1/categories/` сбрасывается при создании категории'
+        )
+
+        client.get('/api/v1/titles/')
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'HIT'
+        assert 'X-Cache' not in admin_client.get('/api/v1/titles/'), (
+            'Проверьте, что `/api/v1/titles/` кэшируется только для анонимных запросов'
+        )
+        admin_client.post(f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 7})
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что кэш `/api/v1/titles/` сбрасывается при создании отзыва'
+        )
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что кэш `/api/v1/titles/` сбрасывается при удалении жанра'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_01_invalidate_on_commit(self, client):
+        client.get('/api/v1/categories/')
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            response = client.get('/api/v1/categories/')
+            assert response['X-Cache'] == 'HIT', (
+                'Проверьте, что версия кэша не меняется до коммита транзакции'
+            )
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS' and response.json()['count'] == 1, (
+            'Проверьте, что кэш сбрасывается после коммита транзакции записи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cache_stats(self, client, admin_client):
+        user, _ = create_users_api(admin_client)
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        response = auth_client(user).get('/api/v1/stats/cache/')
+        assert response.status_code == 403, (
+            'Проверьте, что `/api/v1/stats/cache/` доступен только администратору'
+        )
+        response = admin_client.get('/api/v1/stats/cache/')
+        data = response.json()
+        assert (data['hits'], data['misses']) == (1, 1), (
+            'Проверьте, что `/api/v1/stats/cache/` возвращает счётчики попаданий и промахов'
+        )
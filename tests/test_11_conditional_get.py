@@ -0,0 +1,57 @@
+import pytest
+
+from .common import auth_client, create_comments
+
+
+class Test11ConditionalGetAPI:
+
+    def assert_not_modified(self, client, url, message):
+        response = client.get(url)
+        assert response.status_code == 200 and response.has_header('ETag'), (
+            f'Проверьте, что GET запрос `{url}` возвращает заголовок `ETag`'
+        )
+        assert response.has_header('Last-Modified'), (
+            f'Проверьте, что GET запрос `{url}` возвращает заголовок `Last-Modified`'
+        )
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, message
+        return etag
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_etag(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        for url in (title_url, reviews_url, comments_url):
+            self.assert_not_modified(
+                client, url,
+                f'Проверьте, что GET запрос `{url}` с актуальным `If-None-Match` возвращает статус 304'
+            )
+
+        etag = self.assert_not_modified(client, reviews_url, '')
+        client_user = auth_client(user)
+        client_user.patch(f'{reviews_url}{reviews[1]["id"]}/', data={'text': 'Новый текст'})
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения отзыва `ETag` списка отзывов меняется'
+        )
+
+        etag = self.assert_not_modified(client, comments_url, '')
+        client_user.delete(f'{comments_url}{comments[1]["id"]}/')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после удаления комментария `ETag` списка комментариев меняется'
+        )
+
+        etag = self.assert_not_modified(client, title_url, '')
+        admin_client.patch(title_url, data={'name': 'Новое название'})
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения тайтла его `ETag` меняется'
+        )
+        response = client.get(f'{reviews_url}?limit=1', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 200, (
+            'Проверьте, что `ETag` учитывает параметры запроса'
+        )
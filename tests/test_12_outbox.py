@@ -0,0 +1,90 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class InspectingEmailBackend(BaseEmailBackend):
+    """Запоминает состояние письма в БД и транзакции в момент отправки."""
+    seen = []
+
+    def send_messages(self, email_messages):
+        from django.db import connection
+        from reviews.models import OutgoingEmail
+
+        for message in email_messages:
+            email = OutgoingEmail.objects.get(recipient=message.to[0])
+            self.seen.append(
+                (connection.in_atomic_block, email.attempts,
+                 email.next_attempt > email.created)
+            )
+        return len(email_messages)
+
+
+class Test12OutboxAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_email(self, client):
+        from reviews.models import OutgoingEmail
+
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что `/api/v1/auth/signup/` не отправляет письмо в запросе'
+        )
+        email = OutgoingEmail.objects.get(recipient=data['email'])
+        assert email.status == OutgoingEmail.PENDING, (
+            'Проверьте, что `/api/v1/auth/signup/` ставит письмо в очередь'
+        )
+        call_command('send_outbox')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT and len(mail.outbox) == 1, (
+            'Проверьте, что команда `send_outbox` отправляет письма из очереди'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retry_with_backoff(self, settings):
+        from reviews.models import OutgoingEmail
+        from reviews.outbox import enqueue_email
+
+        settings.EMAIL_BACKEND = f'{__name__}.FailingEmailBackend'
+        email = enqueue_email('retry@yamdb.fake', 'confirmation_code', '123')
+        call_command('send_outbox', max_attempts=2)
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.PENDING and email.attempts == 1, (
+            'Проверьте, что письмо с ошибкой отправки остаётся в очереди'
+        )
+        assert email.next_attempt > email.created and 'SMTP' in email.last_error, (
+            'Проверьте, что повторная отправка откладывается'
+        )
+        OutgoingEmail.objects.update(next_attempt=email.created)
+        call_command('send_outbox', max_attempts=2)
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.FAILED and email.attempts == 2, (
+            'Проверьте, что после `--max-attempts` неудач письмо помечается failed'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_send_outside_transaction(self, settings):
+        from reviews.models import OutgoingEmail
+        from reviews.outbox import enqueue_email
+
+        settings.EMAIL_BACKEND = f'{__name__}.InspectingEmailBackend'
+        InspectingEmailBackend.seen.clear()
+        enqueue_email('lease@yamdb.fake', 'confirmation_code', '123')
+        call_command('send_outbox')
+        assert InspectingEmailBackend.seen == [(False, 1, True)], (
+            'Проверьте, что письмо отправляется вне транзакции, а перед '
+            'отправкой в БД уже записаны попытка и аренда `next_attempt`'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.SENT and email.attempts == 1, (
+            'Проверьте, что результат отправки записывается после неё'
+        )
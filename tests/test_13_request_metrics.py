@@ -0,0 +1,36 @@
+import pytest
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test13RequestMetricsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_server_timing(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        header = response.get('Server-Timing', '')
+        assert 'db;dur=' in header and 'queries' in header, (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` с временем БД и числом запросов'
+        )
+        assert 'serializer;dur=' in header and 'view;dur=' in header, (
+            'Проверьте, что `Server-Timing` содержит время сериализации и вьюхи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_request_stats(self, client, admin_client, admin):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        response = admin_client.get('/api/v1/stats/requests/')
+        assert response.status_code == 200, (
+            'Проверьте, что администратору доступен `/api/v1/stats/requests/`'
+        )
+        stats = response.json().get('api:title-list')
+        assert stats and stats['count'] >= 1 and stats['avg_queries'] > 0, (
+            'Проверьте, что метрики агрегируются по имени вьюхи `api:title-list`'
+        )
+        user, moderator = create_users_api(admin_client)
+        assert client.get('/api/v1/stats/requests/').status_code == 401
+        assert auth_client(moderator).get('/api/v1/stats/requests/').status_code == 403, (
+            'Проверьте, что метрики запросов доступны только администратору'
+        )
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from .common import auth_client, create_titles, create_users_api
+
+
+def parse(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            key, value = line.rsplit(' ', 1)
+            samples[key] = float(value)
+    return samples
+
+
+class Test14PrometheusAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_metrics(self, client, admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/', HTTP_AUTHORIZATION='Bearer invalid')
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'metrics', 'email': 'metrics@yamdb.fake'
+        })
+        response = admin_client.get('/metrics')
+        assert response.status_code == 200, (
+            'Проверьте, что администратору доступен `/metrics`'
+        )
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        samples = parse(response.content.decode())
+        key = 'yamdb_http_requests_total{method="GET",route="api:title-list",status="200"}'
+        assert samples.get(key, 0) >= 1, (
+            'Проверьте, что `/metrics` содержит число запросов по маршруту и статусу'
+        )
+        bucket = 'yamdb_http_request_duration_seconds_bucket{route="api:title-list",status="200",le="+Inf"}'
+        assert samples.get(bucket, 0) >= 1, (
+            'Проверьте, что `/metrics` содержит гистограмму длительности запросов'
+        )
+        assert samples.get('yamdb_jwt_auth_failures_total{reason="token_not_valid"}', 0) >= 1, (
+            'Проверьте, что `/metrics` считает отклонённые JWT-токены'
+        )
+        assert samples['yamdb_email_outbox_pending'] == 1, (
+            'Проверьте, что `/metrics` показывает число писем в очереди'
+        )
+        assert any(key.startswith('yamdb_db_queries_per_request_count') for key in samples)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_metrics_permissions(self, client, admin_client):
+        user, moderator = create_users_api(admin_client)
+        assert client.get('/metrics').status_code == 401
+        assert auth_client(moderator).get('/metrics').status_code == 403, (
+            'Проверьте, что `/metrics` доступен только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_metrics_multiprocess(self, client, admin_client, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        key = 'yamdb_http_requests_total{method="GET",route="api:genre-list",status="200"}'
+        (tmp_path / '999999.json').write_text(json.dumps({key: 40}))
+        client.get('/api/v1/genres/')
+        samples = parse(admin_client.get('/metrics').content.decode())
+        assert samples[key] >= 41, (
+            'Проверьте, что `/metrics` суммирует счётчики всех процессов из METRICS_DIR'
+        )
@@ -0,0 +1,85 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from rest_framework.test import APIClient
+
+from .common import create_titles, create_users_api
+
+
+class SqlLog:
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+
+def obtain_token(user):
+    response = APIClient().post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+    return client
+
+
+class Test15StatelessJWTAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_user_query(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        user, moderator = create_users_api(admin_client)
+        client = obtain_token(user)
+        client.get('/api/v1/users/me/')
+        log = SqlLog()
+        with connection.execute_wrapper(log):
+            response = client.post(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                data={'text': 'Отзыв', 'score': 7}
+            )
+        assert response.status_code == 201
+        assert response.json()['author'] == user.username
+        user_queries = [sql for sql in log.statements if 'FROM "reviews_user"' in sql]
+        assert not user_queries, (
+            'Проверьте, что аутентификация по токену из `/api/v1/auth/token/` '
+            'не загружает пользователя из БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_token_revocation(self, admin_client):
+        user, moderator = create_users_api(admin_client)
+        client = obtain_token(moderator)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        admin_client.patch('/api/v1/users/TestModer/', data={'role': 'user'})
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 401, (
+            'Проверьте, что смена роли пользователя отзывает его токены'
+        )
+        client = obtain_token(moderator)
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 200 and response.json()['role'] == 'user'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_me_update(self, admin_client):
+        user, moderator = create_users_api(admin_client)
+        client = obtain_token(moderator)
+        response = client.patch('/api/v1/users/me/', data={'first_name': 'Имя'})
+        assert response.status_code == 200
+        data = response.json()
+        assert data['email'] == 'testmoder@yamdb.fake' and data['bio'] == 'About me mafa yo', (
+            'Проверьте, что PATCH `/api/v1/users/me/` не затирает поля, которых нет в токене'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_rename_keeps_token(self, admin_client):
+        user, moderator = create_users_api(admin_client)
+        client = obtain_token(user)
+        response = client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        assert response.status_code == 200
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 200 and response.json()['username'] == 'renamed', (
+            'Проверьте, что смена своего username не отзывает токен'
+        )
@@ -0,0 +1,119 @@
+import pytest
+from django.core.signals import request_started
+from django.db import connection, connections
+
+from api.db import REPLICA, ReplicaRouter, use_primary, use_replica
+from reviews.models import Review, Title
+
+from .common import auth_client, create_titles, create_users_api
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """Реплика в отдельном файле SQLite; вызов копирует в неё основную базу."""
+    connections.databases[REPLICA] = dict(
+        connections.databases['default'],
+        NAME=str(tmp_path / 'replica.sqlite3'),
+    )
+
+    def replicate():
+        connections['default'].ensure_connection()
+        connections[REPLICA].ensure_connection()
+        connections['default'].connection.backup(connections[REPLICA].connection)
+
+    yield replicate
+    connections[REPLICA].close()
+    delattr(connections._connections, REPLICA)
+    del connections.databases[REPLICA]
+
+
+class Test16DatabaseProfile:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_sqlite_pragmas(self, settings):
+        connection.close()
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+            cursor.execute('PRAGMA cache_size')
+            cache_size = cursor.fetchone()[0]
+        assert synchronous == 1, (
+            'Проверьте, что к соединению с SQLite применяется `synchronous=NORMAL`'
+        )
+        assert cache_size == settings.SQLITE_PRAGMAS['cache_size'], (
+            'Проверьте, что к соединению с SQLite применяется `cache_size`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_health_check(self, monkeypatch):
+        connection.ensure_connection()
+        closed = []
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+        request_started.send(sender=None)
+        assert closed, (
+            'Проверьте, что перед запросом закрываются неработающие постоянные соединения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_replica_reads(self, client, admin_client, replica, settings):
+        titles, categories, genres = create_titles(admin_client)
+        user, moderator = create_users_api(admin_client)
+        replica()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client = auth_client(user)
+        user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert client.get(url).json()['count'] == 0, (
+            'Проверьте, что GET отзывов анонимного клиента читается с реплики'
+        )
+        assert user_client.get(url).json()['count'] == 1, (
+            'Проверьте, что после записи клиент читает с основной базы'
+        )
+        user_client.cookies.clear()
+        assert user_client.get(url).json()['count'] == 1, (
+            'Проверьте, что клиент без cookie закрепляется за основной базой по токену'
+        )
+
+        settings.DB_REPLICATION_LAG = 0
+        moderator_client = auth_client(moderator)
+        moderator_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert moderator_client.get(url).json()['count'] == 0, (
+            'Проверьте, что закрепление за основной базой длится DB_REPLICATION_LAG секунд'
+        )
+        assert Review.objects.count() == 2
+
+        settings.DB_REPLICATION_LAG = 5
+        response = auth_client(moderator).options(url)
+        assert 'pin_primary' not in response.cookies, (
+            'Проверьте, что OPTIONS не закрепляет клиента за основной базой'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_cache_filled_from_primary(self, client, admin_client, replica):
+        replica()
+        admin_client.post('/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'})
+        response = client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'MISS' and response.json()['count'] == 1, (
+            'Проверьте, что промах кэша заполняется с основной базы, '
+            'а не с отстающей реплики'
+        )
+        assert client.get('/api/v1/genres/').json()['count'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_replica_router(self, replica):
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) is None
+        with use_replica():
+            assert router.db_for_read(Title) == REPLICA, (
+                'Проверьте, что внутри use_replica() чтение идёт с реплики'
+            )
+            assert router.db_for_write(Title) == 'default'
+            assert router.db_for_read(Title) is None, (
+                'Проверьте, что после записи в запросе чтение идёт с основной базы'
+            )
+        with use_replica(), use_primary():
+            assert router.db_for_read(Title) is None, (
+                'Проверьте, что внутри use_primary() чтение идёт с основной базы'
+            )
+        assert not router.allow_migrate(REPLICA, 'reviews')
@@ -0,0 +1,157 @@
+import json
+
+import pytest
+from django.db import connection
+
+from reviews.models import Category, Genre, Title
+
+from .common import auth_client, create_users_api
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Test17BulkAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_catalogue(self, client, admin_client):
+        response = admin_client.post('/api/v1/genres/bulk/', data=[
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ], format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что `/api/v1/genres/bulk/` принимает JSON-массив'
+        )
+        assert sorted(response.json()['created']) == ['comedy', 'drama']
+        body = '\n'.join(json.dumps(item) for item in (
+            {'name': 'Фильм', 'slug': 'films'},
+            {'name': 'Книга', 'slug': 'books'},
+        ))
+        response = admin_client.post(
+            '/api/v1/categories/bulk/', data=body,
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что `/api/v1/categories/bulk/` принимает NDJSON'
+        )
+        assert Category.objects.count() == 2
+
+        titles = [
+            {'name': f'Тайтл {number}', 'year': 2000 + number,
+             'genre': ['drama', 'comedy'], 'category': 'films'}
+            for number in range(50)
+        ]
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = admin_client.post('/api/v1/titles/bulk/', data=titles, format='json')
+        assert response.status_code == 201
+        created = response.json()['created']
+        assert len(created) == 50 and Title.objects.count() == 50
+        assert counter.count < 25, (
+            'Проверьте, что число запросов массовой загрузки не растёт с числом тайтлов'
+        )
+        title = Title.objects.get(pk=created[7])
+        assert title.name == 'Тайтл 7' and title.category.slug == 'films'
+        assert set(title.genre.values_list('slug', flat=True)) == {'drama', 'comedy'}, (
+            'Проверьте, что массовая загрузка записывает жанры тайтлов'
+        )
+        response = client.get('/api/v1/titles/?search=Тайтл')
+        assert response.json()['count'] == 50, (
+            'Проверьте, что загруженные тайтлы попадают в поисковый индекс'
+        )
+
+        response = admin_client.post('/api/v1/titles/bulk/', data=[
+            {'id': created[0], 'name': 'Новое имя', 'genre': ['comedy']},
+        ], format='json')
+        assert response.json()['updated'] == [created[0]]
+        title = Title.objects.get(pk=created[0])
+        assert title.name == 'Новое имя' and title.year == 2000
+        assert list(title.genre.values_list('slug', flat=True)) == ['comedy']
+        response = client.get(f'/api/v1/titles/{created[0]}/')
+        assert response.json()['name'] == 'Новое имя'
+
+        etag = response['ETag']
+        admin_client.post('/api/v1/categories/bulk/', data=[
+            {'name': 'Кино', 'slug': 'films'},
+        ], format='json')
+        response = client.get(f'/api/v1/titles/{created[0]}/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response.json()['category']['name'] == 'Кино', (
+            'Проверьте, что переименование категории сбрасывает ETag её тайтлов'
+        )
+        etag = response['ETag']
+        admin_client.post('/api/v1/genres/bulk/', data=[
+            {'name': 'Юмор', 'slug': 'comedy'},
+        ], format='json')
+        response = client.get(f'/api/v1/titles/{created[0]}/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response.json()['genre'][0]['name'] == 'Юмор', (
+            'Проверьте, что переименование жанра сбрасывает ETag его тайтлов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_errors(self, admin_client):
+        Genre.objects.create(name='Драма', slug='drama')
+        response = admin_client.post('/api/v1/titles/bulk/', data=[
+            {'name': 'Верный', 'genre': ['drama']},
+            {'name': 'Без жанра', 'genre': ['unknown']},
+            {'year': 2000},
+            {'id': 100500, 'name': 'Нет такого'},
+        ], format='json')
+        assert response.status_code == 400
+        errors = {error['index']: error['errors'] for error in response.json()['errors']}
+        assert set(errors) == {1, 2, 3}, (
+            'Проверьте, что ошибки массовой загрузки возвращаются по номерам элементов'
+        )
+        assert 'genre' in errors[1] and 'name' in errors[2] and 'id' in errors[3]
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке в одном элементе ничего не сохраняется'
+        )
+        response = admin_client.post('/api/v1/genres/bulk/', data=[
+            {'name': 'A', 'slug': 'a'}, {'name': 'B', 'slug': 'a'},
+        ], format='json')
+        assert response.status_code == 400 and Genre.objects.count() == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_01_bulk_genre_names(self, admin_client):
+        data = [{'name': 'Рок', 'slug': 'rock'}, {'name': 'Драма', 'slug': 'drama'}]
+        admin_client.post('/api/v1/genres/bulk/', data=data, format='json')
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = admin_client.post('/api/v1/genres/bulk/', data=data, format='json')
+        assert response.status_code == 201 and response.json() == {'created': [], 'updated': []}, (
+            'Проверьте, что повторная загрузка тех же жанров проходит без ошибок'
+        )
+        assert counter.count < 10, (
+            'Проверьте, что названия жанров проверяются одним запросом, а не по одному на элемент'
+        )
+
+        response = admin_client.post('/api/v1/genres/bulk/', data=[
+            {'name': 'Джаз', 'slug': 'jazz'},
+            {'name': 'Джаз', 'slug': 'jazz-2'},
+            {'name': 'Рок', 'slug': 'rock-2'},
+        ], format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что повтор названия жанра возвращает ошибки элементов, а не 500'
+        )
+        errors = {error['index']: error['errors'] for error in response.json()['errors']}
+        assert set(errors) == {1, 2} and all('name' in item for item in errors.values()), (
+            'Проверьте, что повторы названий в запросе и среди существующих жанров '
+            'возвращаются по номерам элементов'
+        )
+        assert Genre.objects.count() == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_permissions(self, client, admin_client):
+        user, moderator = create_users_api(admin_client)
+        data = [{'name': 'Драма', 'slug': 'drama'}]
+        assert client.post('/api/v1/genres/bulk/', data=data, content_type='application/json').status_code == 401
+        response = auth_client(moderator).post('/api/v1/genres/bulk/', data=data, format='json')
+        assert response.status_code == 403, (
+            'Проверьте, что массовая загрузка доступна только администратору'
+        )
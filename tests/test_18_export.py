@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from .common import auth_client, create_reviews, create_users_api
+
+
+def read(response):
+    assert response.streaming, (
+        'Проверьте, что выгрузка отдаётся через StreamingHttpResponse'
+    )
+    return b''.join(response.streaming_content).decode()
+
+
+class Test18ExportAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_csv(self, admin_client, admin, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        response = admin_client.get('/api/v1/export/review.csv')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.reader(io.StringIO(read(response))))
+        path = os.path.join(settings.BASE_DIR, 'static', 'data', 'review.csv')
+        with open(path, encoding='utf-8') as source:
+            header = next(csv.reader(source))
+        assert rows[0] == header, (
+            'Проверьте, что колонки выгрузки отзывов совпадают с `static/data/review.csv`'
+        )
+        assert len(rows) == len(reviews) + 1
+        assert rows[1][3] == str(admin.id) and rows[1][5].endswith('Z')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_ndjson(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        response = admin_client.get('/api/v1/export/titles.ndjson')
+        assert response.status_code == 200
+        items = [json.loads(line) for line in read(response).splitlines()]
+        assert len(items) == len(titles), (
+            'Проверьте, что NDJSON-выгрузка содержит по строке на тайтл'
+        )
+        assert set(items[0]) == {'id', 'name', 'year', 'category'}
+        response = admin_client.get('/api/v1/export/users.ndjson')
+        usernames = {json.loads(line)['username'] for line in read(response).splitlines()}
+        assert {'TestUser', 'TestModer'} <= usernames
+        assert admin_client.get('/api/v1/export/review.xml').status_code == 404
+        assert admin_client.get('/api/v1/export/unknown.csv').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_permissions(self, client, admin_client):
+        user, moderator = create_users_api(admin_client)
+        assert client.get('/api/v1/export/review.csv').status_code == 401
+        assert auth_client(moderator).get('/api/v1/export/review.csv').status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
@@ -0,0 +1,34 @@
+import pytest
+
+from reviews.models import Title
+
+from .common import create_comments
+
+
+class Test19ValuesFastPathAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_identical_output(self, admin_client, admin, settings):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        Title.objects.create(name='Без категории', year=1999)
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/titles/?limit=10',
+            '/api/v1/titles/?genre=comedy',
+            '/api/v1/titles/?search=Поворот',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/?limit=2&offset=1',
+            f'/api/v1/titles/{title_id}/reviews/?pagination=cursor&limit=2',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        )
+        for url in urls:
+            settings.VALUES_FAST_PATH = False
+            expected = admin_client.get(url)
+            settings.VALUES_FAST_PATH = True
+            response = admin_client.get(url)
+            assert response.status_code == expected.status_code == 200
+            assert response.content == expected.content, (
+                f'Проверьте, что быстрый list `{url}` совпадает с выводом сериализатора'
+            )
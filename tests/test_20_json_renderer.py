@@ -0,0 +1,58 @@
+import io
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+from .common import create_reviews
+
+DATA = OrderedDict((
+    ('text', 'Кириллица "кавычки" \\ \x01 \n \u2028 \u2029 😀'),
+    ('pub_date', datetime(2022, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)),
+    ('day', date(2022, 1, 2)),
+    ('rating', Decimal('7.50')),
+    ('lazy', gettext_lazy('Not found.')),
+    (1, [None, True, 1.5, {'nested': []}]),
+))
+
+
+class Test20JSONRendererAPI:
+
+    @pytest.mark.parametrize('backend', ['orjson', 'json'])
+    def test_01_renderer_output(self, settings, backend):
+        settings.API_JSON_BACKEND = backend
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA), (
+            'Проверьте, что FastJSONRenderer выводит те же байты, что и JSONRenderer'
+        )
+        assert FastJSONRenderer().render(DATA, 'application/json; indent=4') == (
+            JSONRenderer().render(DATA, 'application/json; indent=4')
+        )
+
+    @pytest.mark.parametrize('backend', ['orjson', 'json'])
+    def test_02_parser(self, settings, backend):
+        settings.API_JSON_BACKEND = backend
+        stream = io.BytesIO('{"name": "Драма", "slug": "drama"}'.encode())
+        assert FastJSONParser().parse(stream) == {'name': 'Драма', 'slug': 'drama'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_api_output(self, admin_client, admin, settings):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            settings.API_JSON_BACKEND = 'json'
+            expected = admin_client.get(url).content
+            settings.API_JSON_BACKEND = 'orjson'
+            assert admin_client.get(url).content == expected, (
+                f'Проверьте, что ответ `{url}` не зависит от JSON-бэкенда'
+            )
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name": ', content_type='application/json'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что некорректный JSON в теле запроса возвращает 400'
+        )
@@ -0,0 +1,84 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+def scores(**counts):
+    return {str(score): counts.get(f's{score}', 0) for score in range(1, 11)}
+
+
+class Test21ScoreHistogramAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/rating/'
+        response = admin_client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что `{url}` доступен и возвращает статус 200'
+        )
+        assert response.json() == {
+            'scores': scores(s3=1, s4=1, s5=1),
+            'count': 3, 'mean': 4, 'median': 4,
+        }, (
+            'Проверьте, что эндпоинт возвращает распределение оценок, '
+            'число отзывов, среднюю и медиану'
+        )
+
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        assert admin_client.get(url).json() == {
+            'scores': scores(s4=1, s9=1),
+            'count': 2, 'mean': 6.5, 'median': 6.5,
+        }, (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'и удалении отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_without_reviews(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/rating/')
+        assert response.status_code == 200 and response.json() == {
+            'scores': scores(), 'count': 0, 'mean': None, 'median': None,
+        }, (
+            'Проверьте, что для тайтла без отзывов возвращаются нули, '
+            'а средняя и медиана равны `None`'
+        )
+        response = client.get('/api/v1/titles/9999/rating/')
+        assert response.status_code == 404, (
+            'Проверьте, что для несуществующего тайтла возвращается 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuild_command(self, admin_client, admin):
+        from reviews.models import ScoreHistogram
+
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        ScoreHistogram.objects.all().delete()
+        call_command('rebuild_score_histograms')
+        url = f'/api/v1/titles/{titles[0]["id"]}/rating/'
+        assert admin_client.get(url).json()['scores'] == scores(
+            s3=1, s4=1, s5=1
+        ), (
+            'Проверьте, что команда `rebuild_score_histograms` '
+            'пересчитывает распределение оценок'
+        )
+
+        ScoreHistogram.objects.all().delete()
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 10}
+        )
+        assert admin_client.get(url).json()['scores'] == scores(
+            s4=1, s5=1, s10=1
+        ), (
+            'Проверьте, что отсутствующее распределение восстанавливается '
+            'по отзывам при следующем изменении'
+        )
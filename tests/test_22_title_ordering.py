@@ -0,0 +1,80 @@
+import pytest
+
+from .common import auth_client, create_reviews, create_titles
+
+
+def names(response):
+    return [title['name'] for title in response.json()['results']]
+
+
+class Test22TitleOrderingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ordering(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                          data={'text': 'отлично', 'score': 9})
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Без отзывов', 'year': 1990, 'genre': [],
+            'category': titles[0]['category'],
+        })
+        cases = {
+            'rating': ['Поворот туда', 'Проект', 'Без отзывов'],
+            '-rating': ['Проект', 'Поворот туда', 'Без отзывов'],
+            'year': ['Без отзывов', 'Поворот туда', 'Проект'],
+            '-name': ['Проект', 'Поворот туда', 'Без отзывов'],
+            '-review_count': ['Поворот туда', 'Проект', 'Без отзывов'],
+        }
+        for ordering, expected in cases.items():
+            response = client.get(f'/api/v1/titles/?ordering={ordering}')
+            assert response.status_code == 200 and names(response) == (
+                expected
+            ), (
+                f'Проверьте, что `/api/v1/titles/?ordering={ordering}` '
+                'сортирует тайтлы'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ordering_with_filter(self, admin_client, admin):
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Тоже туда', 'year': 2001, 'genre': [],
+            'category': titles[0]['category'],
+        })
+        title_id = admin_client.get(
+            '/api/v1/titles/?name=Тоже'
+        ).json()['results'][0]['id']
+        auth_client(user).post(f'/api/v1/titles/{title_id}/reviews/',
+                               data={'text': 'лучше', 'score': 8})
+        url = (f'/api/v1/titles/?category={titles[0]["category"]}'
+               '&ordering=-rating')
+        response = admin_client.get(url)
+        assert names(response) == ['Тоже туда', 'Поворот туда'], (
+            'Проверьте, что `ordering` сочетается с фильтрами `TitlesFilter`'
+        )
+        response = admin_client.get('/api/v1/titles/?ordering=description')
+        assert response.status_code == 200, (
+            'Проверьте, что сортировка по неразрешённому полю игнорируется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_unrated_titles(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.filter(pk=titles[0]['id']).update(
+            rating=7, review_count=1, score_sum=7
+        )
+        for ordering in ('rating', '-rating'):
+            response = client.get(f'/api/v1/titles/?ordering={ordering}')
+            assert names(response) == ['Поворот туда', 'Проект'], (
+                'Проверьте, что при сортировке по рейтингу тайтлы без '
+                'отзывов идут в конце списка'
+            )
+            assert response.json()['count'] == 2, (
+                'Проверьте, что сортировка не меняет число тайтлов'
+            )
+        response = client.get('/api/v1/titles/?ordering=-year')
+        assert names(response) == ['Проект', 'Поворот туда'], (
+            'Проверьте, что сортировка по другим полям выводит все тайтлы'
+        )
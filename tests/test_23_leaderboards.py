@@ -0,0 +1,157 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+def ids(response):
+    return [title['id'] for title in response.json()['results']]
+
+
+class Test23LeaderboardsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_refresh_and_cache_headers(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get('/api/v1/leaderboards/')
+        assert response.status_code == 200 and ids(response) == [], (
+            'Проверьте, что до пересчёта `/api/v1/leaderboards/` '
+            'возвращает пустую доску'
+        )
+
+        call_command('refresh_leaderboards')
+        response = client.get('/api/v1/leaderboards/')
+        assert ids(response) == [titles[0]['id']], (
+            'Проверьте, что команда `refresh_leaderboards` строит общую доску '
+            'из тайтлов с отзывами'
+        )
+        assert response.json()['results'][0]['score'] == 4, (
+            'Проверьте, что на доске выводится байесовская оценка тайтла'
+        )
+        assert 'max-age=' in response['Cache-Control'] and (
+            response.has_header('ETag')
+        ), (
+            'Проверьте, что доска отдаётся с заголовками Cache-Control и ETag'
+        )
+        response = client.get(
+            '/api/v1/leaderboards/', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении ETag возвращается 304'
+        )
+
+        category = titles[1]['category']
+        genre = titles[1]['genre'][0]
+        for url in (f'/api/v1/leaderboards/categories/{category}/',
+                    f'/api/v1/leaderboards/genres/{genre}/'):
+            response = client.get(url)
+            assert response.status_code == 200 and ids(response) == [], (
+                f'Проверьте, что `{url}` возвращает доску без тайтлов '
+                'без отзывов'
+            )
+        response = client.get('/api/v1/leaderboards/genres/unknown/')
+        assert response.status_code == 404, (
+            'Проверьте, что для несуществующего жанра возвращается 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_incremental_update(self, client, admin_client, admin):
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        call_command('refresh_leaderboards')
+        etag = client.get('/api/v1/leaderboards/')['ETag']
+
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        admin_client.post(url, data={'text': 'шедевр', 'score': 10})
+        auth_client(user).post(url, data={'text': 'отлично', 'score': 10})
+        response = client.get('/api/v1/leaderboards/')
+        assert ids(response) == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что новые отзывы обновляют доску без пересчёта'
+        )
+        assert response['ETag'] != etag, (
+            'Проверьте, что после обновления доски меняется ETag'
+        )
+        response = client.get(
+            f'/api/v1/leaderboards/categories/{titles[1]["category"]}/'
+        )
+        assert ids(response) == [titles[1]['id']], (
+            'Проверьте, что отзыв обновляет доску категории тайтла'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bayesian_average(self, client, admin_client, admin, settings):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                          data={'text': 'неплохо', 'score': 6})
+        # Средняя по отзывам: (5 + 3 + 4 + 6) / 4 = 4.5.
+        settings.LEADERBOARD_PRIOR_WEIGHT = 4
+        call_command('refresh_leaderboards')
+        scores = [
+            title['score']
+            for title in client.get('/api/v1/leaderboards/').json()['results']
+        ]
+        assert scores == [(4 * 4.5 + 6) / 5, (4 * 4.5 + 12) / 7], (
+            'Проверьте, что тайтлы ранжируются по байесовской средней'
+        )
+        settings.LEADERBOARD_PRIOR_WEIGHT = 0
+        call_command('refresh_leaderboards')
+        scores = [
+            title['score']
+            for title in client.get('/api/v1/leaderboards/').json()['results']
+        ]
+        assert scores == [6, 4], (
+            'Проверьте, что при LEADERBOARD_PRIOR_WEIGHT = 0 используется '
+            'обычная средняя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_board_built_before_reviews(self, client, admin_client):
+        from .common import create_titles
+
+        titles, _, _ = create_titles(admin_client)
+        call_command('refresh_leaderboards')
+        admin_client.post(f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                          data={'text': 'отлично', 'score': 9})
+        results = client.get('/api/v1/leaderboards/').json()['results']
+        assert [title['score'] for title in results] == [9], (
+            'Проверьте, что доска, построенная до первых отзывов, '
+            'считает оценку по общей средней, а не по нулю'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_incremental_without_rescan(self, client, admin_client, admin,
+                                           settings):
+        from django.db import connection
+
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                          data={'text': 'неплохо', 'score': 5})
+        settings.LEADERBOARD_SIZE = 1
+        call_command('refresh_leaderboards')
+        assert ids(client.get('/api/v1/leaderboards/')) == [titles[1]['id']]
+
+        statements = []
+
+        def log(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(log):
+            auth_client(user).patch(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+                f'{reviews[1]["id"]}/',
+                data={'score': 10}
+            )
+        rescans = [sql for sql in statements if 'leaderboard_score' in sql]
+        assert not rescans, (
+            'Проверьте, что тайтл, обгоняющий последнего на доске, '
+            'встаёт на неё без запроса по всем тайтлам'
+        )
+        assert ids(client.get('/api/v1/leaderboards/')) == [titles[0]['id']]
+
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        )
+        assert ids(client.get('/api/v1/leaderboards/')) == [titles[1]['id']], (
+            'Проверьте, что тайтл, опустившийся ниже тайтла вне полной доски, '
+            'уступает ему место'
+        )
@@ -0,0 +1,100 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_comments
+
+
+class Test24CountersAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_counters_in_responses(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[0]['id']
+        response = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert response.json()['review_count'] == 3, (
+            'Проверьте, что в ответе тайтла есть `review_count`'
+        )
+        url = f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        assert admin_client.get(url).json()['comment_count'] == 3, (
+            'Проверьте, что в ответе отзыва есть `comment_count`'
+        )
+
+        admin_client.delete(f'{url}comments/{comments[0]["id"]}/')
+        counts = {
+            review['id']: review['comment_count']
+            for review in admin_client.get(
+                f'/api/v1/titles/{title_id}/reviews/'
+            ).json()['results']
+        }
+        assert counts[reviews[0]['id']] == 2, (
+            'Проверьте, что удаление комментария уменьшает `comment_count`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reconcile_command(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        Review.objects.update(comment_count=7)
+        Title.objects.filter(pk=titles[0]['id']).update(
+            review_count=0, score_sum=0
+        )
+        call_command('reconcile_counters')
+        review = Review.objects.get(pk=reviews[0]['id'])
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert review.comment_count == 3, (
+            'Проверьте, что команда `reconcile_counters` исправляет '
+            '`comment_count` отзывов'
+        )
+        assert (title.review_count, title.score_sum, title.rating) == (
+            3, 12, 4
+        ), (
+            'Проверьте, что команда `reconcile_counters` исправляет '
+            'счётчики отзывов тайтла'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_comment_under_other_title(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        other_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        for write in (
+            lambda: admin_client.post(other_url, data={'text': 'abc'}),
+            lambda: admin_client.patch(f'{other_url}{comments[0]["id"]}/', data={'text': 'abc'}),
+            lambda: admin_client.delete(f'{other_url}{comments[1]["id"]}/'),
+        ):
+            etag = admin_client.get(url)['ETag']
+            write()
+            response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                'Проверьте, что запись комментария сбрасывает ETag тайтла '
+                'его отзыва, даже если в адресе указан другой тайтл'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_delete_user_with_reviews(self, admin_client, admin):
+        _, reviews, titles, user, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = admin_client.get(title_url)['ETag']
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204, (
+            'Проверьте, что администратор может удалить пользователя'
+        )
+        response = admin_client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что удаление автора отзыва сбрасывает ETag тайтла'
+        )
+        assert response.json()['review_count'] == 2, (
+            'Проверьте, что удаление пользователя пересчитывает счётчики '
+            'тайтлов с его отзывами'
+        )
+        rating = admin_client.get(f'{title_url}rating/').json()
+        assert (rating['count'], rating['mean'], rating['scores']['3']) == (2, 4.5, 0), (
+            'Проверьте, что удаление пользователя убирает его оценки '
+            'из распределения'
+        )
+        review = admin_client.get(f'{title_url}reviews/{reviews[0]["id"]}/')
+        assert review.json()['comment_count'] == 2, (
+            'Проверьте, что удаление пользователя уменьшает `comment_count` '
+            'отзывов с его комментариями'
+        )
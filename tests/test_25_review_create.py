@@ -0,0 +1,51 @@
+import pytest
+
+from .common import auth_client, create_reviews
+
+
+class Test25ReviewCreateAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_duplicate_review(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = auth_client(user).post(
+            url, data={'text': 'ещё раз', 'score': 10}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение '
+            'возвращает статус 400'
+        )
+        assert response.json() == {
+            'non_field_errors': ['К этому произведению уже оставлен отзыв.']
+        }, (
+            'Проверьте, что при повторном отзыве возвращается ошибка '
+            'в `non_field_errors`'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert Review.objects.filter(title=title).count() == 3 and (
+            (title.review_count, title.score_sum) == (3, 12)
+        ), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг тайтла'
+        )
+
+        response = auth_client(user).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'первый', 'score': 6}
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что после отклонённого отзыва пользователь '
+            'может оставить отзыв на другое произведение'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_missing_title(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/titles/9999/reviews/', data={'text': 'нет', 'score': 5}
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв на несуществующее произведение '
+            'возвращает статус 404'
+        )